@@ -10,6 +10,7 @@ import structlog
 
 from app.core.database import get_db
 from app.core.rate_limiter import limiter
+from app.core.realtime import progress_snapshot
 from app.models.analysis import Analysis
 from app.models.repository import Repository
 from app.schemas.analysis import AnalysisCreate, AnalysisResponse
@@ -98,7 +99,14 @@ async def get_analysis(
     if not analysis:
         raise HTTPException(status_code=404, detail="Analysis not found")
     
-    return analysis
+    response = AnalysisResponse.model_validate(analysis)
+    # Workers write progress to Postgres at most every couple of seconds; the Redis
+    # snapshot carries every tick while the analysis is running.
+    if analysis.status not in ("completed", "failed"):
+        snapshot = await progress_snapshot(analysis_id)
+        if snapshot and snapshot["status"]:
+            response = response.model_copy(update=snapshot)
+    return response
 
 
 @router.get("/repository/{repository_id}", response_model=List[AnalysisResponse])
@@ -12,7 +12,6 @@ from app.core.database import get_db
 from app.core.rate_limiter import limiter
 from app.models.repository import Repository
 from app.schemas.repository import RepositoryCreate, RepositoryResponse
-from app.services.git_service import GitService
 
 router = APIRouter()
 logger = structlog.get_logger()
@@ -3,10 +3,10 @@ Multi-layer caching implementation
 Redis (hot) + PostgreSQL (cold) + file cache
 """
 
-import json
 import hashlib
 from typing import Optional, Any
 from functools import wraps
+import orjson
 import redis.asyncio as redis
 import structlog
 from app.core.config import settings
@@ -60,7 +60,7 @@ class CacheManager:
             value = await self.redis_client.get(key)
             if value:
                 logger.debug("Cache hit", key=key)
-                return json.loads(value)
+                return orjson.loads(value)
             logger.debug("Cache miss", key=key)
             return None
         except Exception as e:
@@ -81,7 +81,7 @@ class CacheManager:
             await self.redis_client.setex(
                 key,
                 ttl,
-                json.dumps(value)
+                orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS)
             )
             logger.debug("Cache set", key=key, ttl=ttl)
         except Exception as e:
@@ -28,12 +28,15 @@ class Settings(BaseSettings):
     # Redis
     REDIS_URL: str = "redis://localhost:6379/0"
     CACHE_TTL_SECONDS: int = 3600
+    INSIGHT_CACHE_TTL_SECONDS: int = 86400
+    AI_INSIGHTS_CACHE_TTL_SECONDS: int = 86400
     REDIS_CACHE_PREFIX: str = "codevoyage:cache:"
     
     # Celery
     CELERY_BROKER_URL: str = "redis://localhost:6379/0"
     CELERY_RESULT_BACKEND: str = "redis://localhost:6379/0"
     CELERY_TASK_TIMEOUT: int = 3600
+    CELERY_PIPELINE_TIMEOUT: int = 14400
     CELERY_MAX_RETRIES: int = 3
     CELERY_WORKER_CONCURRENCY: int = 4
     
@@ -2,8 +2,9 @@
 Database configuration and session management
 """
 
+from sqlalchemy import create_engine
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-from sqlalchemy.orm import declarative_base
+from sqlalchemy.orm import Session, declarative_base, sessionmaker
 from app.core.config import settings
 
 # Convert postgresql:// to postgresql+asyncpg://
@@ -30,6 +31,25 @@ AsyncSessionLocal = async_sessionmaker(
     autoflush=False,
 )
 
+# Sync engine for Celery workers: tasks issue one query at a time, so the
+# psycopg2 driver avoids event-loop round-trips for every DB call.
+sync_engine = create_engine(
+    settings.DATABASE_URL,
+    echo=settings.DEBUG,
+    pool_size=5,
+    max_overflow=10,
+    pool_pre_ping=True,
+    pool_recycle=3600,
+)
+
+SyncSessionLocal = sessionmaker(
+    sync_engine,
+    class_=Session,
+    expire_on_commit=False,
+    autocommit=False,
+    autoflush=False,
+)
+
 # Base class for models
 Base = declarative_base()
 
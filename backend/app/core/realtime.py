@@ -1,11 +1,11 @@
 """
-Realtime progress publish/subscribe helpers backed by Redis Pub/Sub.
+Realtime progress publish/subscribe helpers backed by Redis Streams.
 """
 
 from __future__ import annotations
 
 import json
-from typing import AsyncIterator, Dict, Any
+from typing import AsyncIterator, Dict, Any, List
 
 import redis.asyncio as redis
 import structlog
@@ -14,37 +14,128 @@ from app.core.config import settings
 
 logger = structlog.get_logger()
 
-PROGRESS_CHANNEL = "codevoyage:analysis:progress"
+# Global stream tailed by the API for websocket fanout, plus a short per-analysis
+# stream so late or reconnecting subscribers can replay what they missed.
+PROGRESS_STREAM = "codevoyage:analysis:progress"
+PROGRESS_STREAM_MAXLEN = 10_000
+ANALYSIS_EVENTS_MAXLEN = 100
+PROGRESS_KEY_TTL_SECONDS = 24 * 3600
+
+
+def progress_key(analysis_id: str) -> str:
+    """Redis hash holding the latest progress snapshot for an analysis."""
+    return f"codevoyage:analysis:{analysis_id}:progress"
+
+
+def events_key(analysis_id: str) -> str:
+    """Capped Redis stream of recent progress events for an analysis."""
+    return f"codevoyage:analysis:{analysis_id}:events"
 
 
 async def publish_progress_event(event: Dict[str, Any]) -> None:
-    """Publish analysis progress event for websocket fanout."""
+    """Record the latest progress snapshot and append the event to the progress streams."""
     client = await redis.from_url(settings.REDIS_URL, encoding="utf-8", decode_responses=True)
     try:
-        await client.publish(PROGRESS_CHANNEL, json.dumps(event))
+        analysis_id = event["analysis_id"]
+        key = progress_key(analysis_id)
+        history_key = events_key(analysis_id)
+        fields = {"data": json.dumps(event)}
+        # The per-analysis stream reuses the global entry id, so live and replayed
+        # copies of an event carry the same id and subscribers can skip repeats.
+        entry_id = await client.xadd(PROGRESS_STREAM, fields, maxlen=PROGRESS_STREAM_MAXLEN, approximate=True)
+        async with client.pipeline(transaction=False) as pipe:
+            pipe.hset(
+                key,
+                mapping={
+                    "progress": event["progress"],
+                    "status": event["status"],
+                    "error_message": event.get("error_message") or "",
+                },
+            )
+            pipe.expire(key, PROGRESS_KEY_TTL_SECONDS)
+            pipe.xadd(history_key, fields, id=entry_id, maxlen=ANALYSIS_EVENTS_MAXLEN, approximate=True)
+            pipe.expire(history_key, PROGRESS_KEY_TTL_SECONDS)
+            await pipe.execute()
     except Exception as exc:
         logger.warning("Failed to publish progress event", error=str(exc))
     finally:
         await client.close()
 
 
-async def subscribe_progress_events() -> AsyncIterator[Dict[str, Any]]:
-    """Yield progress events from redis pubsub channel."""
+async def progress_snapshot(analysis_id: str) -> Dict[str, Any] | None:
+    """Return the latest progress snapshot recorded for an analysis, if any."""
+    client = await redis.from_url(settings.REDIS_URL, encoding="utf-8", decode_responses=True)
+    try:
+        snapshot = await client.hgetall(progress_key(analysis_id))
+    except Exception as exc:
+        logger.warning("Failed to read progress snapshot", error=str(exc), analysis_id=analysis_id)
+        return None
+    finally:
+        await client.close()
+    if not snapshot:
+        return None
+    try:
+        progress = int(snapshot["progress"])
+    except (KeyError, ValueError):
+        return None
+    return {
+        "progress": progress,
+        "status": snapshot.get("status", ""),
+        "error_message": snapshot.get("error_message") or None,
+    }
+
+
+def _decode_entry(entry_id: str, fields: Dict[str, str]) -> Dict[str, Any] | None:
+    raw = fields.get("data")
+    if not raw:
+        return None
+    try:
+        event = json.loads(raw)
+    except json.JSONDecodeError:
+        logger.warning("Invalid progress payload in stream", payload=raw)
+        return None
+    event["id"] = entry_id
+    return event
+
+
+async def subscribe_progress_events(last_id: str | None = None) -> AsyncIterator[Dict[str, Any]]:
+    """Yield progress events appended to the global progress stream after ``last_id``.
+
+    Without ``last_id`` the stream is read from now on. Each event carries its entry
+    id under ``"id"``; pass the last one back in to resume without losing entries.
+    """
+    client = await redis.from_url(settings.REDIS_URL, encoding="utf-8", decode_responses=True)
+    try:
+        if last_id is None:
+            # Resolve "$" to a concrete id once; re-sending "$" after an empty block
+            # would skip entries added between two XREAD calls.
+            latest = await client.xrevrange(PROGRESS_STREAM, count=1)
+            last_id = latest[0][0] if latest else "0-0"
+        while True:
+            response = await client.xread({PROGRESS_STREAM: last_id}, block=5000, count=100)
+            for _stream, entries in response or []:
+                for entry_id, fields in entries:
+                    last_id = entry_id
+                    event = _decode_entry(entry_id, fields)
+                    if event is not None:
+                        yield event
+    finally:
+        await client.close()
+
+
+async def progress_history(analysis_id: str, after_id: str | None = None) -> List[Dict[str, Any]]:
+    """Return the recent progress events recorded for an analysis, oldest first.
+
+    With ``after_id`` only events recorded after that entry id are returned.
+    """
     client = await redis.from_url(settings.REDIS_URL, encoding="utf-8", decode_responses=True)
-    pubsub = client.pubsub()
-    await pubsub.subscribe(PROGRESS_CHANNEL)
     try:
-        async for message in pubsub.listen():
-            if message.get("type") != "message":
-                continue
-            raw = message.get("data")
-            if not raw:
-                continue
-            try:
-                yield json.loads(raw)
-            except json.JSONDecodeError:
-                logger.warning("Invalid progress payload in pubsub", payload=raw)
+        entries = await client.xrange(events_key(analysis_id), min=f"({after_id}" if after_id else "-")
+    except Exception as exc:
+        logger.warning("Failed to read progress history", error=str(exc), analysis_id=analysis_id)
+        return []
     finally:
-        await pubsub.unsubscribe(PROGRESS_CHANNEL)
-        await pubsub.close()
         await client.close()
+    return [
+        event for entry_id, fields in entries if (event := _decode_entry(entry_id, fields)) is not None
+    ]
@@ -18,7 +18,7 @@ from app.api import api_router
 from app.core.logging import setup_logging
 from app.core.rate_limiter import limiter
 from app.core.cache import cache_manager
-from app.core.realtime import subscribe_progress_events
+from app.core.realtime import progress_history, subscribe_progress_events
 from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 
@@ -39,9 +39,12 @@ progress_listener_task: asyncio.Task | None = None
 
 
 async def _fanout_progress_events():
+    # Kept across restarts so entries added while the listener backs off are still delivered.
+    last_id: str | None = None
     while True:
         try:
-            async for event in subscribe_progress_events():
+            async for event in subscribe_progress_events(last_id):
+                last_id = event["id"]
                 analysis_id = event.get("analysis_id")
                 if not analysis_id:
                     continue
@@ -157,8 +160,18 @@ async def subscribe_analysis(sid, data):
     """Subscribe to analysis progress updates"""
     analysis_id = data.get('analysis_id')
     if analysis_id:
+        # Replay what the client missed before joining the room, so history arrives in
+        # order ahead of live events. Reconnecting clients pass the last id they saw.
+        last_id = data.get('last_event_id')
+        for event in await progress_history(analysis_id, last_id):
+            await sio.emit("analysis_progress", event, room=sid)
+            last_id = event["id"]
         await sio.enter_room(sid, f"analysis_{analysis_id}")
         logger.info("Client subscribed to analysis", sid=sid, analysis_id=analysis_id)
+        # Catch up on events published while replaying. One may also arrive live from
+        # the room; events carry their stream id so clients drop ids already seen.
+        for event in await progress_history(analysis_id, last_id):
+            await sio.emit("analysis_progress", event, room=sid)
 
 
 if __name__ == "__main__":
@@ -1,7 +1,7 @@
 """Analysis schemas"""
 
 from pydantic import BaseModel
-from typing import Optional, Dict, Any
+from typing import Optional, Any
 from datetime import datetime
 from uuid import UUID
 
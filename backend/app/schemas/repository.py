@@ -1,6 +1,6 @@
 """Repository schemas"""
 
-from pydantic import BaseModel, HttpUrl
+from pydantic import BaseModel
 from typing import Optional
 from datetime import datetime
 from uuid import UUID
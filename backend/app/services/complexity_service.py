@@ -38,8 +38,8 @@ class ComplexityService:
             if ext == '.py':
                 return self._analyze_python(content, file_path)
             
-            # Use lizard for other languages
-            return self._analyze_with_lizard(file_path)
+            # Use lizard for other languages, on the content already read
+            return self._analyze_with_lizard(file_path, content)
         except Exception as e:
             logger.error("Failed to analyze file complexity", error=str(e), file=file_path)
             return {'error': str(e)}
@@ -67,10 +67,14 @@ class ComplexityService:
             logger.error("Failed to analyze Python file", error=str(e))
             return {'error': str(e)}
     
-    def _analyze_with_lizard(self, file_path: str) -> Dict[str, Any]:
+    def _analyze_with_lizard(self, file_path: str, content: str) -> Dict[str, Any]:
         """Analyze file with lizard"""
         try:
-            analysis = lizard.analyze_file(file_path)
+            # lizard.analyze_file(path) would re-open and re-read the file; lizard's own
+            # reader strips a UTF-8 BOM, so do the same before handing the text over.
+            if content.startswith('\ufeff'):
+                content = content[1:]
+            analysis = lizard.analyze_file.analyze_source_code(file_path, content)
             
             if not analysis.function_list:
                 return {
@@ -5,9 +5,9 @@ Handles cloning and analyzing Git repositories
 
 import os
 import shutil
+from collections import Counter
 from typing import List, Dict, Any, Optional, Callable
 from datetime import datetime
-import git
 from git import Repo
 from git.remote import RemoteProgress
 import structlog
@@ -70,6 +70,8 @@ class GitService:
             return clone_path
         except Exception as e:
             logger.error("Failed to clone repository", error=str(e), url=url)
+            # Drop a partial checkout; callers only learn the path on success.
+            shutil.rmtree(clone_path, ignore_errors=True)
             raise
     
     def get_commits(
@@ -107,8 +109,17 @@ class GitService:
             logger.error("Failed to get commits", error=str(e), repo_path=repo_path)
             raise
     
-    def get_file_tree(self, repo_path: str, commit_sha: Optional[str] = None) -> Dict[str, Any]:
-        """Get file tree structure"""
+    def get_file_tree(
+        self,
+        repo_path: str,
+        commit_sha: Optional[str] = None,
+        language_stats: Optional[Counter] = None,
+    ) -> Dict[str, Any]:
+        """Get file tree structure
+
+        When ``language_stats`` is given, file extensions are counted into it while
+        the tree is built, so callers need no second walk over the result.
+        """
         try:
             repo = Repo(repo_path)
             
@@ -117,7 +128,7 @@ class GitService:
             else:
                 commit = repo.head.commit
             
-            tree_data = self._build_tree(commit.tree, "")
+            tree_data = self._build_tree(commit.tree, "", language_stats)
             
             logger.info("File tree extracted", repo_path=repo_path)
             return tree_data
@@ -125,7 +136,7 @@ class GitService:
             logger.error("Failed to get file tree", error=str(e), repo_path=repo_path)
             raise
     
-    def _build_tree(self, tree, path: str) -> Dict[str, Any]:
+    def _build_tree(self, tree, path: str, language_stats: Optional[Counter] = None) -> Dict[str, Any]:
         """Recursively build file tree"""
         result = {
             'name': os.path.basename(path) or 'root',
@@ -139,9 +150,13 @@ class GitService:
             
             if item.type == 'tree':
                 # Directory
-                result['children'].append(self._build_tree(item, item_path))
+                result['children'].append(self._build_tree(item, item_path, language_stats))
             else:
                 # File
+                if language_stats is not None and '.' in item_path:
+                    ext = item_path[item_path.rfind('.') + 1:]
+                    if ext:
+                        language_stats[ext] += 1
                 result['children'].append({
                     'name': item.name,
                     'path': item_path,
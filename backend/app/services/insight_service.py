@@ -5,11 +5,29 @@ Produces rich analytics without depending on LLM availability.
 
 from __future__ import annotations
 
-from collections import Counter, defaultdict
-from datetime import datetime, timedelta
+from bisect import bisect_left, bisect_right
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+import hashlib
+import heapq
+from itertools import accumulate
+import json
 import math
+from operator import itemgetter
+import os
+import re
+import sys
 from statistics import median
-from typing import Any, Dict, List
+import time
+from typing import Any, Dict, List, Tuple
+
+import orjson
+import structlog
+
+from app.core.config import settings
+
+logger = structlog.get_logger()
 
 
 REFACTOR_KEYWORDS = (
@@ -21,6 +39,216 @@ REFACTOR_KEYWORDS = (
     "extract",
     "modular",
 )
+_REFACTOR_RE = re.compile("|".join(map(re.escape, REFACTOR_KEYWORDS)), re.IGNORECASE)
+_STABILITY_RE = re.compile("revert|hotfix", re.IGNORECASE)
+
+CONFIG_EXTENSIONS = (".json", ".yaml", ".yml", ".toml", ".ini")
+WEEKDAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+
+# Display labels for anomaly types (the type with underscores spelled as spaces).
+_ANOMALY_LABELS = {
+    anomaly_type: anomaly_type.replace("_", " ")
+    for anomaly_type in (
+        "mega_commit",
+        "off_hours_heavy_change",
+        "wide_surface_area",
+        "stability_event",
+        "daily_burst",
+        "long_gap",
+    )
+}
+
+# Pre-mortem failure modes as (mode, label, applies, probability, cap); the callables
+# take (complexity, neighbor_files, size_bytes, risk_score).
+_FAILURE_MODE_SPECS = (
+    (
+        "branch_logic_regression",
+        "Branch-heavy logic may regress on edge paths.",
+        lambda c, n, s, r: c >= 20,
+        lambda c, n, s, r: 42 + c * 1.1,
+        95.0,
+    ),
+    (
+        "integration_side_effect",
+        "Wide module surface increases hidden integration side-effects.",
+        lambda c, n, s, r: n >= 40,
+        lambda c, n, s, r: 35 + n * 0.6,
+        95.0,
+    ),
+    (
+        "review_blind_spot",
+        "Large artifact size can reduce review depth and miss subtle defects.",
+        lambda c, n, s, r: s >= 250000,
+        lambda c, n, s, r: 28 + math.log2(s + 1) * 4,
+        90.0,
+    ),
+    (
+        "rollback_likelihood",
+        "High blast-radius score indicates elevated rollback risk.",
+        lambda c, n, s, r: r >= 70,
+        lambda c, n, s, r: 30 + r * 0.5,
+        95.0,
+    ),
+)
+# Used when none of the specific modes apply.
+_FALLBACK_FAILURE_MODE = (
+    "localized_regression",
+    "Localized functional regression remains possible.",
+    None,
+    lambda c, n, s, r: 18 + r * 0.25,
+    70.0,
+)
+
+# Executive summary lines: (insights section, str.format template, extractor, needs commits).
+# An empty section or an extractor returning None skips the line; rows derived from commit
+# history are skipped when no commits were analyzed.
+_EXEC_SUMMARY_ROWS = (
+    (
+        "summary",
+        "Analyzed {} commits across {} contributors.",
+        lambda s: (s["total_commits_analyzed"], s["total_contributors"]),
+        True,
+    ),
+    (
+        "team_dynamics",
+        "Top contributor owns {}% of commits; bus factor(50%) is {}.",
+        lambda t: (t["top_contributor_commit_share_percent"], t["bus_factor_50_percent"]),
+        True,
+    ),
+    (
+        "development_habits",
+        "Night-time commit ratio is {}%, revealing delivery-window habits.",
+        lambda h: (h["night_commit_ratio"],),
+        True,
+    ),
+    (
+        "complexity_profile",
+        "Detected {} high-risk files by cyclomatic complexity.",
+        lambda c: (c["high_risk_file_count"],),
+        False,
+    ),
+    (
+        "repository_structure",
+        "Repository shape: {} files across {} directories (depth {}).",
+        lambda r: (r["total_files"], r["total_directories"], r["max_depth"]),
+        False,
+    ),
+    (
+        "insight_quality",
+        "Insight confidence score: {}/100.",
+        lambda q: (q["confidence_score"],),
+        False,
+    ),
+    (
+        "release_readiness",
+        "Release readiness is {}/100 ({}).",
+        lambda r: (r.get("score", 0), str(r.get("tier", "unknown")).upper()),
+        False,
+    ),
+    (
+        "collaboration_story",
+        "Collaboration index is {} with {} cross-author handoffs.",
+        lambda c: (c.get("collaboration_index", 0), c.get("metrics", {}).get("handoff_events", 0)),
+        True,
+    ),
+    (
+        "bus_factor_shock_test",
+        "Bus-factor shock resilience is {} with top-share concentration at {}%.",
+        lambda b: (b.get("resilience_score", 0), b.get("top_contributor_share_percent", 0)),
+        True,
+    ),
+    (
+        "engineering_weather_forecast",
+        "Engineering weather outlook is {} (pressure index {}).",
+        lambda f: (str(f.get("outlook", "unknown")).upper(), f.get("pressure_index", 0)),
+        True,
+    ),
+    (
+        "anomaly_detective",
+        "Anomaly detective flagged {} events (risk index {}).",
+        lambda a: (a.get("anomaly_count", 0), a.get("risk_index", 0)),
+        True,
+    ),
+    (
+        "ai_action_briefs",
+        "Top recommended action: {}.",
+        lambda b: (b["top_priority"].get("title", "N/A"),) if b.get("top_priority") else None,
+        False,
+    ),
+    (
+        # build_insights always emits both keys for each hotspot entry.
+        "complexity_profile",
+        "Top hotspot: {} (complexity={}).",
+        lambda c: (c["hotspots"][0]["path"], c["hotspots"][0]["cyclomatic_complexity"]) if c["hotspots"] else None,
+        False,
+    ),
+)
+
+# Pre-mortem mitigations: the base set, plus extras appended by risk score and CI presence.
+_BASE_MITIGATIONS = (
+    "Add targeted regression tests for changed interfaces and edge paths.",
+    "Assign at least one reviewer with recent ownership in this directory.",
+    "Use a small-scope rollout plan with measurable rollback signals.",
+)
+_FLAG_MITIGATION = ("Deploy behind feature flags or staged canary gates.",)
+_SMOKE_TEST_MITIGATION = ("Run manual smoke tests until CI coverage is available.",)
+
+# First steps for each action-brief category.
+_HOTSPOT_FIRST_STEPS = (
+    "Add boundary tests and a rollback validation checklist for this path.",
+    "Break upcoming PRs into isolated slices limited to one risk mode.",
+    "Gate merge on two approvals including one reviewer outside the primary owner.",
+)
+_OWNERSHIP_FIRST_STEPS = (
+    "Create a two-week ownership rotation for top two critical directories.",
+    "Require shadow reviewers from a second team on high-risk PRs.",
+    "Document runbooks for the top three blast-radius modules.",
+)
+_ANOMALY_FIRST_STEPS = (
+    "Flag mega-commit and wide-surface changes for synchronous review before merge.",
+    "Add PR template checks for off-hours high-change submissions.",
+    "Run weekly anomaly review in sprint quality sync.",
+)
+_WEATHER_FIRST_STEPS = (
+    "Limit concurrent high-risk changes per sprint lane.",
+    "Allocate explicit time for debt and test reinforcement in next iteration.",
+    "Track review lag and incident risk as release guardrails.",
+)
+_READINESS_FIRST_STEPS = (
+    "Close failing release gates and unresolved high-severity risk flags.",
+    "Add a pre-release dry run with rollback rehearsal.",
+    "Publish a release checklist owned by cross-functional reviewers.",
+)
+_CADENCE_FIRST_STEPS = (
+    "Continue weekly quality and ownership reviews.",
+    "Monitor hotspot score drift and forecast pressure.",
+    "Capture learnings from major PRs in lightweight runbooks.",
+)
+
+# Engineering weather forecast summary per outlook.
+_FORECAST_SUMMARIES = {
+    "sunny": "Stable trajectory with low operational pressure.",
+    "cloudy": "Mixed signals; prioritize risk controls while maintaining velocity.",
+    "stormy": "Elevated delivery pressure forecasted; reduce risk before scaling release pace.",
+}
+
+# Action-brief roadmap windows; briefs fill them in priority order, defaults pad the rest.
+_ROADMAP_WINDOWS = ("Days 1-3", "Days 4-7", "Week 2")
+_ROADMAP_DEFAULT_FOCUS = ("Stabilize top risk", "Improve ownership resilience", "Lift readiness score")
+
+# File size buckets, indexed by bisect_right(_SIZE_BUCKET_EDGES, size_bytes).
+_SIZE_BUCKET_EDGES = (10 * 1024, 100 * 1024, 1024 * 1024)
+_SIZE_BUCKET_LABELS = ("<10KB", "10KB-100KB", "100KB-1MB", ">1MB")
+
+# Release-readiness tiers, indexed by bisect_right(_READINESS_THRESHOLDS, score).
+_READINESS_THRESHOLDS = (55, 70, 85)
+_READINESS_TIERS = ("not_ready", "hardening", "stabilizing", "ready")
+_READINESS_RECOMMENDATIONS = (
+    "Block release. Resolve critical risk flags and failing quality gates.",
+    "Needs hardening. Prioritize tests/CI and ownership resilience.",
+    "Near-ready. Address failing gates before broad rollout.",
+    "Release posture is strong. Maintain current guardrails and monitor regressions.",
+)
 
 
 def _parse_datetime(value: Any) -> datetime | None:
@@ -34,6 +262,16 @@ def _parse_datetime(value: Any) -> datetime | None:
     return None
 
 
+def _utc_now_iso() -> str:
+    return datetime.utcnow().isoformat() + "Z"
+
+
+def _iso_week_key(value: datetime) -> str:
+    """ISO week label (same as strftime("%G-W%V")) built from integer fields."""
+    year, week, _ = value.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
 def _safe_int(value: Any, default: int = 0) -> int:
     try:
         return int(value)
@@ -45,9 +283,135 @@ def _clamp(value: float, minimum: float, maximum: float) -> float:
     return max(minimum, min(maximum, value))
 
 
+def _get_float(mapping: Dict[str, Any], *keys: str, default: float = 0.0) -> float:
+    """float() of the first key present in mapping; a falsy value there yields default."""
+    for key in keys:
+        if key in mapping:
+            value = mapping[key]
+            return float(value) if value else default
+    return default
+
+
+def _get_int(mapping: Dict[str, Any], *keys: str, default: int = 0) -> int:
+    """int() of the first key present in mapping; a falsy value there yields default."""
+    for key in keys:
+        if key in mapping:
+            value = mapping[key]
+            return int(value) if value else default
+    return default
+
+
+def _sorted_median(values: List[int]) -> float:
+    """Median of an already-sorted list by direct indexing (statistics.median re-sorts a copy)."""
+    mid = len(values) // 2
+    if len(values) % 2:
+        return values[mid]
+    return (values[mid - 1] + values[mid]) / 2
+
+
+def _r2(value: float) -> float:
+    """Round half away from zero to 2dp; cheaper than round() for display-only values."""
+    return int(value * 100 + (0.5 if value >= 0 else -0.5)) / 100.0
+
+
+def _readiness_score(
+    base: float,
+    high: int,
+    medium: int,
+    low: int,
+    has_tests: bool,
+    has_ci: bool,
+    bus_factor: int,
+    high_risk_files: int,
+) -> float:
+    """Release-readiness score: health score minus risk penalties, clamped to 0-100."""
+    score = (
+        base
+        - high * 12
+        - medium * 6
+        - low * 2
+        - (0 if has_tests else 15)
+        - (0 if has_ci else 15)
+        - (12 if bus_factor <= 1 else 6 if bus_factor <= 2 else 0)
+        - (15 if high_risk_files >= 20 else 8 if high_risk_files >= 10 else 0)
+    )
+    return _r2(max(0.0, min(100.0, score)))
+
+
+def _materialize_hotspot_candidate(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Pre-mortem candidate derived from a complexity hotspot when no blast-radius data exists."""
+    path_str = str(item.get("path") or "")
+    cyc = _get_float(item, "cyclomatic_complexity")
+    return {
+        "path": item.get("path"),
+        "directory": path_str.rsplit("/", 1)[0] if "/" in path_str else ".",
+        "estimated_neighbor_files": 8,
+        "complexity": cyc,
+        "size_bytes": 0,
+        "impact_score": cyc * 2.8,
+        "risk_tier": "high" if cyc >= 18 else "medium",
+    }
+
+
+@dataclass(slots=True)
+class _CommitAggregate:
+    """Per-commit tallies collected in one pass over the normalized commits."""
+
+    commit_sizes: List[int] = field(default_factory=list)
+    # Sizes of the commits that carry a timestamp (the ones in ``ordered``).
+    dated_commit_sizes: List[int] = field(default_factory=list)
+    hourly: Counter = field(default_factory=Counter)
+    weekday: Counter = field(default_factory=Counter)
+    night_commits: int = 0
+    refactor_candidates: List[Dict[str, Any]] = field(default_factory=list)
+    # Commits with a timestamp, oldest first; shared by the timeline aggregators.
+    ordered: List[Dict[str, Any]] = field(default_factory=list)
+
+
 class InsightService:
     """Builds analysis insights from git/complexity outputs."""
 
+    # Bump when the insight payload changes shape so stale cache entries are ignored.
+    CACHE_VERSION = 3
+    # Expired entries are removed at most this often, not on every store.
+    CACHE_PRUNE_INTERVAL_SECONDS = 3600
+
+    def __init__(self, cache_dir: str | None = None):
+        self.cache_dir = cache_dir or os.path.join(settings.TEMP_STORAGE_PATH, "insights")
+        self._last_prune = 0.0
+
+    def cache_key(
+        self,
+        commits: List[Dict[str, Any]],
+        contributors: List[Dict[str, Any]],
+        complexity_metrics: List[Dict[str, Any]],
+        hotspots: List[Dict[str, Any]],
+        language_stats: Dict[str, int],
+        file_tree: Dict[str, Any] | None,
+        repository_id: str | None = None,
+    ) -> str:
+        """Fingerprint of a set of inputs, scoped to the repository.
+
+        Commits, hotspots and the file tree follow from the head commit and the complexity
+        scan, so they add only their sizes and the head sha. Complexity metrics,
+        contributors and language stats are digested in full.
+        """
+        head_sha = commits[0].get("sha", "") if commits else ""
+        tree_size = len(file_tree.get("children") or ()) if file_tree else -1
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(
+            f"{self.CACHE_VERSION}|{repository_id or ''}|{head_sha}|{len(commits)}|{len(contributors)}|"
+            f"{len(complexity_metrics)}|{len(hotspots)}|{tree_size}|".encode()
+        )
+        digest.update(
+            orjson.dumps(
+                (complexity_metrics, contributors, language_stats),
+                default=str,
+                option=orjson.OPT_NON_STR_KEYS,
+            )
+        )
+        return digest.hexdigest()
+
     def build_insights(
         self,
         commits: List[Dict[str, Any]],
@@ -56,35 +420,111 @@ class InsightService:
         hotspots: List[Dict[str, Any]],
         language_stats: Dict[str, int],
         file_tree: Dict[str, Any] | None,
+        repository_id: str | None = None,
+        key: str | None = None,
+    ) -> Dict[str, Any]:
+        """Build insights, reusing a persisted result when the inputs are unchanged.
+
+        ``key`` is this call's cache_key(), for callers that already computed it.
+        """
+        if key is None:
+            key = self.cache_key(
+                commits, contributors, complexity_metrics, hotspots, language_stats, file_tree, repository_id
+            )
+        insights = self._load_cached(key)
+        if insights is None:
+            insights = self._compute_insights(
+                commits, contributors, complexity_metrics, hotspots, language_stats, file_tree
+            )
+            self._store_cached(key, insights)
+        # The only per-call value; stamped here so computed and cached results share it.
+        insights["ai_action_briefs"]["generated_at"] = _utc_now_iso()
+        return insights
+
+    def _load_cached(self, key: str) -> Dict[str, Any] | None:
+        path = os.path.join(self.cache_dir, f"{key}.json")
+        try:
+            if time.time() - os.path.getmtime(path) > settings.INSIGHT_CACHE_TTL_SECONDS:
+                return None
+            with open(path, "r", encoding="utf-8") as fh:
+                return json.load(fh)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning("Insight cache read failed", key=key, error=str(e))
+            return None
+
+    def _store_cached(self, key: str, insights: Dict[str, Any]) -> None:
+        path = os.path.join(self.cache_dir, f"{key}.json")
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as fh:
+                json.dump(insights, fh)
+            # Atomic rename so concurrent readers never see a partial file.
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning("Insight cache write failed", key=key, error=str(e))
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+        now = time.time()
+        if now - self._last_prune >= self.CACHE_PRUNE_INTERVAL_SECONDS:
+            self._last_prune = now
+            self._prune_cache()
+
+    def _prune_cache(self) -> None:
+        """Remove cache entries older than the TTL."""
+        cutoff = time.time() - settings.INSIGHT_CACHE_TTL_SECONDS
+        try:
+            entries = list(os.scandir(self.cache_dir))
+        except OSError:
+            return
+        for entry in entries:
+            try:
+                if entry.name.endswith(".json") and entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+            except OSError:
+                continue
+
+    def _compute_insights(
+        self,
+        commits: List[Dict[str, Any]],
+        contributors: List[Dict[str, Any]],
+        complexity_metrics: List[Dict[str, Any]],
+        hotspots: List[Dict[str, Any]],
+        language_stats: Dict[str, int],
+        file_tree: Dict[str, Any] | None,
     ) -> Dict[str, Any]:
         parsed_commits = [self._normalize_commit(c) for c in commits]
-        commit_sizes = [c["insertions"] + c["deletions"] for c in parsed_commits]
+        aggregate = self._aggregate_commits(parsed_commits)
+        commit_sizes = aggregate.commit_sizes
         commit_sizes_sorted = sorted(commit_sizes)
         total_commits = len(parsed_commits)
         total_changes = sum(commit_sizes)
-
-        hourly = Counter()
-        weekday = Counter()
-        night_commits = 0
-        refactor_candidates = []
-        for c in parsed_commits:
-            dt = c["committed_at"]
-            if dt:
-                hourly[dt.hour] += 1
-                weekday[dt.strftime("%A")] += 1
-                if dt.hour < 6:
-                    night_commits += 1
-            msg = c["message"].lower()
-            if any(k in msg for k in REFACTOR_KEYWORDS):
-                refactor_candidates.append(c)
-
-        top_contributors = sorted(
-            contributors,
-            key=lambda x: _safe_int(x.get("commits"), 0),
-            reverse=True,
-        )
-        contributor_commit_counts = [_safe_int(c.get("commits"), 0) for c in top_contributors]
-        bus_factor = self._bus_factor(contributor_commit_counts)
+        ordered_commits = aggregate.ordered
+        hourly = aggregate.hourly
+        weekday = aggregate.weekday
+        night_commits = aggregate.night_commits
+        refactor_candidates = aggregate.refactor_candidates
+
+        all_commit_counts = [_safe_int(c.get("commits"), 0) for c in contributors]
+        contributor_commit_total = sum(all_commit_counts)
+        positive_counts = [n for n in all_commit_counts if n > 0]
+        positive_commit_total = sum(positive_counts)
+        # The 50% bus factor is reached within the top half of contributors, and the shock
+        # test removes at most five heads, so only that prefix needs to be ranked.
+        top_k = (len(contributors) + 1) // 2 + 5
+        top_idx = heapq.nlargest(top_k, range(len(contributors)), key=all_commit_counts.__getitem__)
+        contributor_commit_counts = [all_commit_counts[i] for i in top_idx]
+        bus_factor = self._bus_factor(contributor_commit_counts, contributor_commit_total)
+        if bus_factor == len(top_idx) < len(contributors):
+            # Degenerate counts (e.g. negatives) can push past the prefix; rank everyone.
+            top_idx = heapq.nlargest(len(contributors), range(len(contributors)), key=all_commit_counts.__getitem__)
+            contributor_commit_counts = [all_commit_counts[i] for i in top_idx]
+            bus_factor = self._bus_factor(contributor_commit_counts, contributor_commit_total)
+        top_contributors = [contributors[i] for i in top_idx]
 
         complexity_values = [
             float(item.get("cyclomatic_complexity", 0) or 0)
@@ -94,58 +534,78 @@ class InsightService:
         high_risk_files = [
             item for item in complexity_metrics if float(item.get("cyclomatic_complexity", 0) or 0) >= 15
         ]
+        high_risk_file_count = len(high_risk_files)
         flat_files, directory_count, max_depth = self._flatten_file_tree(file_tree or {})
-        total_file_size = sum(int(f.get("size", 0) or 0) for f in flat_files)
-        top_large_files = sorted(flat_files, key=lambda x: int(x.get("size", 0) or 0), reverse=True)[:10]
+        file_sizes = [int(f.get("size", 0) or 0) for f in flat_files]
+        total_file_size = sum(file_sizes)
+        top_large_files = [
+            flat_files[i] for i in heapq.nlargest(10, range(len(flat_files)), key=file_sizes.__getitem__)
+        ]
 
+        # Derived ratios shared by several independent sub-reports; computed once here.
+        night_commit_ratio = round((night_commits / total_commits) * 100, 2) if total_commits else 0
+        avg_changes_per_commit = round(total_changes / total_commits, 2) if total_commits else 0
+        top_contributor_share = (
+            round((contributor_commit_counts[0] / total_commits) * 100, 2)
+            if total_commits and contributor_commit_counts
+            else 0
+        )
+
+        language_diversity = self._shannon_diversity(language_stats)
         engineering_signals = self._engineering_signals(flat_files)
         risk_flags = self._risk_flags(
             total_commits=total_commits,
             bus_factor=bus_factor,
-            high_risk_file_count=len(high_risk_files),
+            high_risk_file_count=high_risk_file_count,
             engineering_signals=engineering_signals,
         )
-        time_machine = self._build_time_machine(parsed_commits)
+        time_machine = self._build_time_machine(ordered_commits)
         blast_radius = self._build_blast_radius(flat_files, hotspots, complexity_metrics)
         health_scorecard = self._health_scorecard(
             total_commits=total_commits,
             bus_factor=bus_factor,
-            high_risk_file_count=len(high_risk_files),
+            high_risk_file_count=high_risk_file_count,
             engineering_signals=engineering_signals,
-            language_stats=language_stats,
+            language_diversity=language_diversity,
             complexity_scanned=len(complexity_metrics),
             total_files=len(flat_files),
         )
         fingerprint = self._repo_fingerprint(
             engineering_signals=engineering_signals,
-            habits={"night_commit_ratio": round((night_commits / total_commits) * 100, 2) if total_commits else 0},
+            habits={"night_commit_ratio": night_commit_ratio},
             health_score=health_scorecard["overall_score"],
             language_stats=language_stats,
         )
-        collaboration_story = self._collaboration_story(parsed_commits)
-        weekly_digest = self._weekly_health_digest(parsed_commits)
+        collaboration_story = self._collaboration_story(ordered_commits)
+        weekly_digest = self._weekly_health_digest(ordered_commits)
         release_readiness = self._release_readiness(
             health_scorecard=health_scorecard,
             risk_flags=risk_flags,
             engineering_signals=engineering_signals,
             team_info={"bus_factor": bus_factor},
-            complexity_profile={"high_risk_file_count": len(high_risk_files)},
+            complexity_profile={"high_risk_file_count": high_risk_file_count},
         )
         archetypes = self._repo_archetypes(
             engineering_signals=engineering_signals,
             health_scorecard=health_scorecard,
-            habits={"night_commit_ratio": round((night_commits / total_commits) * 100, 2) if total_commits else 0},
+            habits={"night_commit_ratio": night_commit_ratio},
             summary={
                 "total_commits": total_commits,
-                "avg_changes_per_commit": round(total_changes / total_commits, 2) if total_commits else 0,
-                "top_contributor_share_percent": round((contributor_commit_counts[0] / total_commits) * 100, 2)
-                if total_commits and contributor_commit_counts
-                else 0,
+                "avg_changes_per_commit": avg_changes_per_commit,
+                "top_contributor_share_percent": top_contributor_share,
             },
-            complexity_profile={"high_risk_file_count": len(high_risk_files)},
+            complexity_profile={"high_risk_file_count": high_risk_file_count},
+        )
+        # Every commit is usually dated, in which case the sorted sizes are shared as-is.
+        dated_sizes_sorted = (
+            commit_sizes_sorted
+            if len(ordered_commits) == total_commits
+            else sorted(aggregate.dated_commit_sizes)
+        )
+        anomaly_detective = self._anomaly_detective(ordered_commits, dated_sizes_sorted)
+        bus_factor_shock_test = self._bus_factor_shock_test(
+            top_contributors, total_commits, positive_commit_total, len(positive_counts)
         )
-        anomaly_detective = self._anomaly_detective(parsed_commits)
-        bus_factor_shock_test = self._bus_factor_shock_test(top_contributors, total_commits)
         engineering_weather_forecast = self._engineering_weather_forecast(
             weekly_digest=weekly_digest,
             risk_flags=risk_flags,
@@ -173,10 +633,10 @@ class InsightService:
                 "total_commits_analyzed": total_commits,
                 "total_contributors": len(contributors),
                 "total_code_changes": total_changes,
-                "avg_changes_per_commit": round(total_changes / total_commits, 2) if total_commits else 0,
+                "avg_changes_per_commit": avg_changes_per_commit,
             },
             "development_habits": {
-                "night_commit_ratio": round((night_commits / total_commits) * 100, 2) if total_commits else 0,
+                "night_commit_ratio": night_commit_ratio,
                 "most_active_hours": [
                     {"hour": hour, "commits": count}
                     for hour, count in hourly.most_common(5)
@@ -195,27 +655,23 @@ class InsightService:
                     for c in top_contributors[:5]
                 ],
                 "bus_factor_50_percent": bus_factor,
-                "top_contributor_commit_share_percent": round(
-                    (contributor_commit_counts[0] / total_commits) * 100, 2
-                )
-                if total_commits and contributor_commit_counts
-                else 0,
+                "top_contributor_commit_share_percent": top_contributor_share,
             },
             "commit_behavior": {
-                "median_changes_per_commit": round(median(commit_sizes_sorted), 2) if commit_sizes_sorted else 0,
+                "median_changes_per_commit": round(_sorted_median(commit_sizes_sorted), 2) if commit_sizes_sorted else 0,
                 "p90_changes_per_commit": self._percentile(commit_sizes_sorted, 90),
                 "largest_commits": [
                     {
                         "sha": c["sha"][:10],
                         "author": c["author_name"],
-                        "changes": c["insertions"] + c["deletions"],
+                        "changes": c["changes"],
                         "message": c["message"][:120],
                     }
-                    for c in sorted(
+                    for c in heapq.nlargest(
+                        5,
                         parsed_commits,
-                        key=lambda x: x["insertions"] + x["deletions"],
-                        reverse=True,
-                    )[:5]
+                        key=itemgetter("changes"),
+                    )
                 ],
             },
             "refactor_signals": {
@@ -232,14 +688,14 @@ class InsightService:
             "language_profile": {
                 "languages": self._rank_languages(language_stats),
                 "dominant_language": max(language_stats, key=language_stats.get) if language_stats else None,
-                "language_diversity_index": self._shannon_diversity(language_stats),
+                "language_diversity_index": language_diversity,
             },
             "complexity_profile": {
                 "files_scanned": len(complexity_metrics),
                 "avg_cyclomatic_complexity": round(sum(complexity_values) / len(complexity_values), 2)
                 if complexity_values
                 else 0,
-                "high_risk_file_count": len(high_risk_files),
+                "high_risk_file_count": high_risk_file_count,
                 "hotspots": [
                     {
                         "path": h.get("path"),
@@ -260,7 +716,7 @@ class InsightService:
                     }
                     for f in top_large_files
                 ],
-                "size_distribution": self._size_distribution(flat_files),
+                "size_distribution": self._size_distribution(file_sizes),
             },
             "engineering_signals": engineering_signals,
             "risk_flags": risk_flags,
@@ -282,20 +738,58 @@ class InsightService:
         insights["executive_summary"] = self._executive_summary(insights)
         return insights
 
+    def _aggregate_commits(self, parsed_commits: List[Dict[str, Any]]) -> _CommitAggregate:
+        agg = _CommitAggregate()
+        sizes = agg.commit_sizes
+        dated_sizes = agg.dated_commit_sizes
+        hourly = agg.hourly
+        weekday = agg.weekday
+        refactors = agg.refactor_candidates
+        dated = agg.ordered
+        night_commits = 0
+        for c in parsed_commits:
+            size = c["changes"]
+            sizes.append(size)
+            dt = c["committed_at"]
+            if dt:
+                dated_sizes.append(size)
+                hourly[dt.hour] += 1
+                weekday[WEEKDAYS[dt.weekday()]] += 1
+                dated.append(c)
+            if c["is_night"]:
+                night_commits += 1
+            if c["is_refactor"]:
+                refactors.append(c)
+        agg.night_commits = night_commits
+        dated.sort(key=lambda x: x["committed_at"])
+        return agg
+
     def _normalize_commit(self, commit: Dict[str, Any]) -> Dict[str, Any]:
         stats = commit.get("stats") or {}
+        message = str(commit.get("message", ""))
+        committed_at = _parse_datetime(commit.get("committed_at"))
+        insertions = _safe_int(stats.get("insertions"), 0)
+        deletions = _safe_int(stats.get("deletions"), 0)
         return {
             "sha": str(commit.get("sha", "")),
-            "message": str(commit.get("message", "")),
-            "author_name": str(commit.get("author_name", "unknown")),
-            "insertions": _safe_int(stats.get("insertions"), 0),
-            "deletions": _safe_int(stats.get("deletions"), 0),
+            "message": message,
+            # Interned so per-author sets/counters hash and compare by identity.
+            "author_name": sys.intern(str(commit.get("author_name", "unknown"))),
+            "insertions": insertions,
+            "deletions": deletions,
+            "changes": insertions + deletions,
             "files_changed": _safe_int(stats.get("files"), 0),
-            "committed_at": _parse_datetime(commit.get("committed_at")),
+            "committed_at": committed_at,
+            # Signals shared by several aggregators, derived once per commit.
+            "is_night": bool(committed_at and committed_at.hour < 6),
+            "is_refactor": _REFACTOR_RE.search(message) is not None,
+            "is_stability": _STABILITY_RE.search(message) is not None,
         }
 
-    def _bus_factor(self, commit_counts: List[int]) -> int:
-        total = sum(commit_counts)
+    def _bus_factor(self, commit_counts: List[int], total: int | None = None) -> int:
+        """Contributors needed to cover 50% of commits; ``total`` overrides sum(commit_counts)."""
+        if total is None:
+            total = sum(commit_counts)
         if total <= 0:
             return 0
         running = 0
@@ -307,6 +801,15 @@ class InsightService:
                 return people
         return people
 
+    def _bus_factor_from_prefix(self, prefix: List[int], start: int, total: int) -> int:
+        """_bus_factor over ranked positive counts, given their prefix sums, from ``start`` on."""
+        if total <= 0:
+            return 0
+        base = prefix[start - 1] if start else 0
+        # running / total >= 0.5  <=>  running >= ceil(total / 2) for integer counts.
+        idx = bisect_left(prefix, base + (total + 1) // 2, start)
+        return idx - start + 1 if idx < len(prefix) else len(prefix) - start
+
     def _percentile(self, values: List[int], percentile: int) -> float:
         if not values:
             return 0
@@ -315,6 +818,24 @@ class InsightService:
         idx = int((percentile / 100) * (len(values) - 1))
         return float(values[idx])
 
+    def _percentiles(self, values: List[int], percentiles: tuple[int, ...]) -> tuple[float, ...]:
+        """Several _percentile lookups on one sorted list, sharing the length and empty checks."""
+        if not values:
+            return (0,) * len(percentiles)
+        last = len(values) - 1
+        if not last:
+            return (float(values[0]),) * len(percentiles)
+        return tuple(float(values[int((q / 100) * last)]) for q in percentiles)
+
+    def _percentile_unsorted(self, values: List[int], percentile: int) -> float:
+        """Same result as _percentile(sorted(values)) via a bounded heap for high percentiles."""
+        if not values:
+            return 0
+        if len(values) == 1:
+            return float(values[0])
+        idx = int((percentile / 100) * (len(values) - 1))
+        return float(heapq.nlargest(len(values) - idx, values)[-1])
+
     def _rank_languages(self, language_stats: Dict[str, int]) -> List[Dict[str, Any]]:
         total = sum(language_stats.values())
         ranked = sorted(language_stats.items(), key=lambda x: x[1], reverse=True)
@@ -332,53 +853,49 @@ class InsightService:
         directory_count = 0
         max_depth = 0
 
-        def walk(node: Dict[str, Any], depth: int):
-            nonlocal directory_count, max_depth
-            max_depth = max(max_depth, depth)
+        # Explicit-stack DFS; children are pushed reversed so files keep pre-order.
+        stack = [(root, 0)] if root else []
+        while stack:
+            node, depth = stack.pop()
+            if depth > max_depth:
+                max_depth = depth
             node_type = node.get("type")
             if node_type == "directory":
                 directory_count += 1
-                for child in node.get("children", []):
-                    if isinstance(child, dict):
-                        walk(child, depth + 1)
+                stack.extend(
+                    (child, depth + 1)
+                    for child in reversed(node.get("children", []))
+                    if isinstance(child, dict)
+                )
             elif node_type == "file":
                 files.append(node)
 
-        if root:
-            walk(root, 0)
         return files, max(0, directory_count - 1), max_depth
 
-    def _size_distribution(self, files: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        buckets = {
-            "<10KB": 0,
-            "10KB-100KB": 0,
-            "100KB-1MB": 0,
-            ">1MB": 0,
-        }
-        for f in files:
-            size = int(f.get("size", 0) or 0)
-            if size < 10 * 1024:
-                buckets["<10KB"] += 1
-            elif size < 100 * 1024:
-                buckets["10KB-100KB"] += 1
-            elif size < 1024 * 1024:
-                buckets["100KB-1MB"] += 1
-            else:
-                buckets[">1MB"] += 1
-        return [{"bucket": k, "files": v} for k, v in buckets.items()]
+    def _size_distribution(self, sizes: List[int]) -> List[Dict[str, Any]]:
+        counts = [0] * len(_SIZE_BUCKET_LABELS)
+        for size in sizes:
+            counts[bisect_right(_SIZE_BUCKET_EDGES, size)] += 1
+        return [{"bucket": label, "files": n} for label, n in zip(_SIZE_BUCKET_LABELS, counts)]
 
     def _engineering_signals(self, files: List[Dict[str, Any]]) -> Dict[str, Any]:
-        paths = [str(f.get("path", "")).lower() for f in files]
-        has_tests = any("/test" in p or p.startswith("test") or "tests/" in p for p in paths)
-        has_ci = any(".github/workflows/" in p or ".gitlab-ci" in p or "jenkinsfile" in p for p in paths)
-        has_docker = any("dockerfile" in p or "docker-compose" in p for p in paths)
-        has_docs = any(p.startswith("docs/") or p.endswith("readme.md") for p in paths)
-        notebook_count = sum(1 for p in paths if p.endswith(".ipynb"))
-        config_count = sum(
-            1
-            for p in paths
-            if p.endswith((".json", ".yaml", ".yml", ".toml", ".ini"))
-        )
+        has_tests = has_ci = has_docker = has_docs = False
+        notebook_count = 0
+        config_count = 0
+        for f in files:
+            p = str(f.get("path", "")).lower()
+            if not has_tests and ("/test" in p or p.startswith("test") or "tests/" in p):
+                has_tests = True
+            if not has_ci and (".github/workflows/" in p or ".gitlab-ci" in p or "jenkinsfile" in p):
+                has_ci = True
+            if not has_docker and ("dockerfile" in p or "docker-compose" in p):
+                has_docker = True
+            if not has_docs and (p.startswith("docs/") or p.endswith("readme.md")):
+                has_docs = True
+            if p.endswith(".ipynb"):
+                notebook_count += 1
+            elif p.endswith(CONFIG_EXTENSIONS):
+                config_count += 1
         return {
             "has_tests": has_tests,
             "has_ci": has_ci,
@@ -426,17 +943,12 @@ class InsightService:
         total = sum(language_stats.values())
         if total <= 0:
             return 0.0
-        entropy = 0.0
-        for count in language_stats.values():
-            p = count / total
-            entropy -= p * math.log2(p) if p > 0 else 0
-        return round(entropy, 3)
-
-    def _build_time_machine(self, commits: List[Dict[str, Any]]) -> Dict[str, Any]:
-        ordered = sorted(
-            [x for x in commits if x.get("committed_at")],
-            key=lambda x: x["committed_at"],
-        )
+        # H = log2(T) - sum(c * log2(c)) / T, so only one division for the whole mix.
+        log2 = math.log2
+        weighted = sum(count * log2(count) for count in language_stats.values() if count > 0)
+        return round(log2(total) - weighted / total, 3)
+
+    def _build_time_machine(self, ordered: List[Dict[str, Any]]) -> Dict[str, Any]:
         daily: Dict[str, Dict[str, Any]] = {}
         for c in ordered:
             date_key = c["committed_at"].date().isoformat()
@@ -446,51 +958,61 @@ class InsightService:
                     "date": date_key,
                     "day_commits": 0,
                     "day_changes": 0,
-                    "authors": Counter(),
+                    "authors": {},
                     "commit_sha": "",
                 },
             )
-            changes = int(c.get("insertions", 0) or 0) + int(c.get("deletions", 0) or 0)
             point["day_commits"] += 1
-            point["day_changes"] += changes
-            point["authors"][c.get("author_name") or "unknown"] += 1
-            point["commit_sha"] = str(c.get("sha", ""))[:10]
-
+            point["day_changes"] += c["changes"]
+            authors = point["authors"]
+            author = c.get("author_name") or "unknown"
+            authors[author] = authors.get(author, 0) + 1
+            point["commit_sha"] = c["sha"][:10]
+
+        day_points = [daily[date_key] for date_key in sorted(daily)]
+        day_commits = [p["day_commits"] for p in day_points]
+        day_changes = [p["day_changes"] for p in day_points]
+
+        # Downsample long histories to ~250 points while streaming, so skipped days
+        # still feed the rolling/cumulative state but never materialize a dict.
+        step = max(1, len(day_points) // 250) if len(day_points) > 250 else 1
         timeline = []
-        cumulative_commits = 0
-        cumulative_changes = 0
-        rolling_commits: List[int] = []
-        rolling_changes: List[int] = []
-        for date_key in sorted(daily.keys()):
-            day_point = daily[date_key]
-            cumulative_commits += int(day_point["day_commits"])
-            cumulative_changes += int(day_point["day_changes"])
-            rolling_commits.append(int(day_point["day_commits"]))
-            rolling_changes.append(int(day_point["day_changes"]))
-            if len(rolling_commits) > 7:
-                rolling_commits.pop(0)
-            if len(rolling_changes) > 7:
-                rolling_changes.pop(0)
-
-            lead_author = day_point["authors"].most_common(1)[0][0] if day_point["authors"] else "unknown"
+        rolling_commits: deque[int] = deque(maxlen=7)
+        rolling_changes: deque[int] = deque(maxlen=7)
+        window_commits = 0
+        window_changes = 0
+        for i, (day_point, cumulative_commits, cumulative_changes) in enumerate(
+            zip(day_points, accumulate(day_commits), accumulate(day_changes))
+        ):
+            # Running window sums: subtract the day about to be evicted, add the new one.
+            if len(rolling_commits) == 7:
+                window_commits -= rolling_commits[0]
+                window_changes -= rolling_changes[0]
+            window_commits += day_point["day_commits"]
+            window_changes += day_point["day_changes"]
+            rolling_commits.append(day_point["day_commits"])
+            rolling_changes.append(day_point["day_changes"])
+            if i % step:
+                continue
+
+            authors = day_point["authors"]
+            # max() keeps the first author reaching the top count, like most_common(1).
+            lead_author = max(authors, key=authors.get) if authors else "unknown"
             timeline.append(
                 {
-                    "date": date_key,
+                    "date": day_point["date"],
                     "commit_sha": day_point["commit_sha"],
                     "author": lead_author,
-                    "day_commits": int(day_point["day_commits"]),
-                    "day_changes": int(day_point["day_changes"]),
-                    "unique_authors": len(day_point["authors"]),
-                    "rolling_7d_commits": int(sum(rolling_commits)),
-                    "rolling_7d_changes": int(sum(rolling_changes)),
+                    "day_commits": day_point["day_commits"],
+                    "day_changes": day_point["day_changes"],
+                    "unique_authors": len(authors),
+                    "rolling_7d_commits": window_commits,
+                    "rolling_7d_changes": window_changes,
                     "cumulative_commits": cumulative_commits,
                     "cumulative_changes": cumulative_changes,
                 }
             )
 
-        if len(timeline) > 250:
-            step = max(1, len(timeline) // 250)
-            timeline = timeline[::step]
         return {
             "points": timeline,
             "window_start": timeline[0]["date"] if timeline else None,
@@ -507,26 +1029,24 @@ class InsightService:
             str(item.get("path")): float(item.get("cyclomatic_complexity", 0) or 0)
             for item in complexity_metrics
         }
-        files_by_dir: Dict[str, int] = {}
-        for f in files:
-            path = str(f.get("path", ""))
-            directory = path.rsplit("/", 1)[0] if "/" in path else "."
-            files_by_dir[directory] = files_by_dir.get(directory, 0) + 1
+        paths = [str(f.get("path", "")) for f in files]
+        files_by_dir = Counter(path.rpartition("/")[0] or "." for path in paths)
+        # Built back to front so the first occurrence of a duplicated path wins.
+        size_by_path = {
+            path: int(f.get("size", 0) or 0)
+            for path, f in zip(reversed(paths), reversed(files))
+        }
 
         candidates = []
         base_candidates = hotspots[:15] if hotspots else [
             {"path": f.get("path"), "cyclomatic_complexity": complexity_by_path.get(str(f.get("path")), 0)}
-            for f in sorted(files, key=lambda x: int(x.get("size", 0) or 0), reverse=True)[:15]
+            for f in heapq.nlargest(15, files, key=lambda x: int(x.get("size", 0) or 0))
         ]
         for item in base_candidates:
             path = str(item.get("path", ""))
-            directory = path.rsplit("/", 1)[0] if "/" in path else "."
+            directory = path.rpartition("/")[0] or "."
             complexity = float(item.get("cyclomatic_complexity", complexity_by_path.get(path, 0)) or 0)
-            size = 0
-            for f in files:
-                if str(f.get("path")) == path:
-                    size = int(f.get("size", 0) or 0)
-                    break
+            size = size_by_path.get(path, 0)
             neighbor_files = files_by_dir.get(directory, 1)
             impact_score = round(min(100.0, complexity * 2.2 + math.log2(size + 2) * 3 + neighbor_files * 0.25), 2)
             candidates.append(
@@ -540,7 +1060,7 @@ class InsightService:
                     "risk_tier": "high" if impact_score >= 70 else "medium" if impact_score >= 40 else "low",
                 }
             )
-        candidates = sorted(candidates, key=lambda x: x["impact_score"], reverse=True)[:20]
+        candidates = heapq.nlargest(20, candidates, key=itemgetter("impact_score"))
         return {"candidates": candidates}
 
     def _health_scorecard(
@@ -549,7 +1069,7 @@ class InsightService:
         bus_factor: int,
         high_risk_file_count: int,
         engineering_signals: Dict[str, Any],
-        language_stats: Dict[str, int],
+        language_diversity: float,
         complexity_scanned: int,
         total_files: int,
     ) -> Dict[str, Any]:
@@ -570,7 +1090,7 @@ class InsightService:
             elif coverage_ratio < 0.5:
                 data_coverage -= 20
         velocity = 100 if total_commits >= 200 else max(30, int(total_commits / 2))
-        architecture = min(100, 40 + int(self._shannon_diversity(language_stats) * 20))
+        architecture = min(100, 40 + int(language_diversity * 20))
 
         dimensions = {
             "ownership_resilience": max(0, ownership),
@@ -615,11 +1135,7 @@ class InsightService:
             labels.append("Refactor Opportunity Zone")
         return {"labels": labels[:6], "tagline": " | ".join(labels[:3])}
 
-    def _collaboration_story(self, commits: List[Dict[str, Any]]) -> Dict[str, Any]:
-        ordered = sorted(
-            [x for x in commits if x.get("committed_at")],
-            key=lambda x: x["committed_at"],
-        )
+    def _collaboration_story(self, ordered: List[Dict[str, Any]]) -> Dict[str, Any]:
         if not ordered:
             return {
                 "headline": "No collaboration timeline available.",
@@ -638,17 +1154,23 @@ class InsightService:
         author_counts = Counter((c.get("author_name") or "unknown") for c in ordered)
         total_commits = len(ordered)
         handoff_pairs: Counter[tuple[str, str]] = Counter()
-        weekly_data: Dict[str, Dict[str, Any]] = defaultdict(
-            lambda: {"commits": 0, "changes": 0, "contributors": set(), "handoffs": 0}
-        )
+        weekly_data: Dict[str, Dict[str, Any]] = {}
 
         previous = None
+        current_week = None
+        bucket: Dict[str, Any] = {}
         for c in ordered:
-            week_key = c["committed_at"].strftime("%G-W%V")
-            bucket = weekly_data[week_key]
+            week_key = _iso_week_key(c["committed_at"])
+            # Commits arrive in time order, so the bucket usually carries over.
+            if week_key != current_week:
+                current_week = week_key
+                bucket = weekly_data.get(week_key)
+                if bucket is None:
+                    # Contributors are appended to a list and deduped only for emitted weeks.
+                    bucket = weekly_data[week_key] = {"commits": 0, "changes": 0, "contributors": [], "handoffs": 0}
             bucket["commits"] += 1
-            bucket["changes"] += int(c.get("insertions", 0) or 0) + int(c.get("deletions", 0) or 0)
-            bucket["contributors"].add(c.get("author_name") or "unknown")
+            bucket["changes"] += c["changes"]
+            bucket["contributors"].append(c.get("author_name") or "unknown")
             if previous and previous.get("author_name") != c.get("author_name"):
                 elapsed_hours = (c["committed_at"] - previous["committed_at"]).total_seconds() / 3600
                 if elapsed_hours <= 72:
@@ -676,7 +1198,7 @@ class InsightService:
         for week_key in sorted(weekly_data.keys())[-16:]:
             bucket = weekly_data[week_key]
             commits_in_week = int(bucket["commits"])
-            contributors_in_week = len(bucket["contributors"])
+            contributors_in_week = len(set(bucket["contributors"]))
             handoffs_in_week = int(bucket["handoffs"])
             density = round((handoffs_in_week / max(1, commits_in_week - 1)) * 100, 2)
             weekly_collaboration.append(
@@ -738,11 +1260,7 @@ class InsightService:
             "narrative": narrative,
         }
 
-    def _weekly_health_digest(self, commits: List[Dict[str, Any]]) -> Dict[str, Any]:
-        ordered = sorted(
-            [x for x in commits if x.get("committed_at")],
-            key=lambda x: x["committed_at"],
-        )
+    def _weekly_health_digest(self, ordered: List[Dict[str, Any]]) -> Dict[str, Any]:
         if not ordered:
             return {
                 "latest_week": None,
@@ -752,43 +1270,65 @@ class InsightService:
                 "highlights": ["No weekly digest available without commit timestamps."],
             }
 
-        weekly: Dict[str, Dict[str, Any]] = defaultdict(
-            lambda: {
-                "commits": 0,
-                "changes": 0,
-                "night_commits": 0,
-                "refactor_commits": 0,
-                "contributors": set(),
-            }
-        )
-        for c in ordered:
-            week_key = c["committed_at"].strftime("%G-W%V")
-            bucket = weekly[week_key]
-            bucket["commits"] += 1
-            bucket["changes"] += int(c.get("insertions", 0) or 0) + int(c.get("deletions", 0) or 0)
-            bucket["contributors"].add(c.get("author_name") or "unknown")
-            if c["committed_at"].hour < 6:
-                bucket["night_commits"] += 1
-            message = str(c.get("message", "")).lower()
-            if any(keyword in message for keyword in REFACTOR_KEYWORDS):
-                bucket["refactor_commits"] += 1
+        # Flat per-week counters indexed by week code. `ordered` is time-sorted, so
+        # the code only needs resolving when the ISO week changes.
+        week_index: Dict[str, int] = {}
+        week_commits: List[int] = []
+        week_changes: List[int] = []
+        week_night: List[int] = []
+        week_refactor: List[int] = []
+        week_contributors: List[int] = []
+        # One shared (week, author) set instead of a contributor set per week.
+        seen_week_authors: set[tuple[int, str]] = set()
+        current_key = None
+        w = -1
+        # Only the 16 latest weeks are reported, so walk newest-first and stop once a
+        # commit is safely older than the 16th-latest week seen (two days of slack
+        # cover commits whose local-time week differs from their instant order).
+        stop_before: datetime | None = None
+        for c in reversed(ordered):
+            dt = c["committed_at"]
+            if stop_before is not None and dt < stop_before:
+                break
+            week_key = _iso_week_key(dt)
+            if week_key != current_key:
+                current_key = week_key
+                w = week_index.get(week_key, -1)
+                if w < 0:
+                    w = week_index[week_key] = len(week_commits)
+                    week_commits.append(0)
+                    week_changes.append(0)
+                    week_night.append(0)
+                    week_refactor.append(0)
+                    week_contributors.append(0)
+                    if len(week_index) >= 16:
+                        year, week = sorted(week_index)[-16].split("-W")
+                        stop_before = datetime.fromisocalendar(int(year), int(week), 1) - timedelta(days=2)
+                        if dt.tzinfo is not None:
+                            stop_before = stop_before.replace(tzinfo=timezone.utc)
+            week_commits[w] += 1
+            week_changes[w] += c["changes"]
+            week_night[w] += c["is_night"]
+            week_refactor[w] += c["is_refactor"]
+            pair = (w, c.get("author_name") or "unknown")
+            if pair not in seen_week_authors:
+                seen_week_authors.add(pair)
+                week_contributors[w] += 1
 
         weeks = []
-        for week_key in sorted(weekly.keys())[-16:]:
-            bucket = weekly[week_key]
-            commits_in_week = int(bucket["commits"])
-            changes_in_week = int(bucket["changes"])
+        for week_key in sorted(week_index)[-16:]:
+            w = week_index[week_key]
+            commits_in_week = week_commits[w]
+            changes_in_week = week_changes[w]
             weeks.append(
                 {
                     "week": week_key,
                     "commits": commits_in_week,
                     "changes": changes_in_week,
-                    "contributors": len(bucket["contributors"]),
-                    "avg_changes_per_commit": round(changes_in_week / commits_in_week, 2) if commits_in_week else 0,
-                    "night_commit_ratio": round((bucket["night_commits"] / commits_in_week) * 100, 2)
-                    if commits_in_week
-                    else 0,
-                    "refactor_commits": int(bucket["refactor_commits"]),
+                    "contributors": week_contributors[w],
+                    "avg_changes_per_commit": _r2(changes_in_week / commits_in_week),
+                    "night_commit_ratio": _r2((week_night[w] / commits_in_week) * 100),
+                    "refactor_commits": week_refactor[w],
                 }
             )
 
@@ -798,13 +1338,13 @@ class InsightService:
         def _delta_pct(current: float, prev: float) -> float:
             if prev == 0:
                 return 100.0 if current > 0 else 0.0
-            return round(((current - prev) / prev) * 100, 2)
+            return _r2(((current - prev) / prev) * 100)
 
         trend = {
             "commit_delta_percent": _delta_pct(latest["commits"], previous["commits"]) if previous else 0.0,
             "change_delta_percent": _delta_pct(latest["changes"], previous["changes"]) if previous else 0.0,
             "contributor_delta": (latest["contributors"] - previous["contributors"]) if previous else 0,
-            "night_ratio_delta": round(latest["night_commit_ratio"] - previous["night_commit_ratio"], 2)
+            "night_ratio_delta": _r2(latest["night_commit_ratio"] - previous["night_commit_ratio"])
             if previous
             else 0.0,
         }
@@ -841,87 +1381,69 @@ class InsightService:
         team_info: Dict[str, Any],
         complexity_profile: Dict[str, Any],
     ) -> Dict[str, Any]:
-        dimensions = health_scorecard.get("dimensions", {})
-        base_score = float(health_scorecard.get("overall_score", 0) or 0)
-        bus_factor = int(team_info.get("bus_factor", 0) or 0)
-        high_risk_file_count = int(complexity_profile.get("high_risk_file_count", 0) or 0)
-
+        # Inputs are assembled by build_insights from already-typed values.
+        dimensions = health_scorecard["dimensions"]
+        base_score = health_scorecard["overall_score"]
+        bus_factor = team_info["bus_factor"]
+        high_risk_file_count = complexity_profile["high_risk_file_count"]
+        has_tests = bool(engineering_signals.get("has_tests"))
+        has_ci = bool(engineering_signals.get("has_ci"))
+
+        flag_severities = Counter(flag.get("severity") for flag in risk_flags)
         severity_counts = {
-            "high": sum(1 for flag in risk_flags if flag.get("severity") == "high"),
-            "medium": sum(1 for flag in risk_flags if flag.get("severity") == "medium"),
-            "low": sum(1 for flag in risk_flags if flag.get("severity") == "low"),
+            "high": flag_severities["high"],
+            "medium": flag_severities["medium"],
+            "low": flag_severities["low"],
         }
 
-        score = base_score
-        score -= severity_counts["high"] * 12
-        score -= severity_counts["medium"] * 6
-        score -= severity_counts["low"] * 2
-        if not engineering_signals.get("has_tests"):
-            score -= 15
-        if not engineering_signals.get("has_ci"):
-            score -= 15
-        if bus_factor <= 1:
-            score -= 12
-        elif bus_factor <= 2:
-            score -= 6
-        if high_risk_file_count >= 20:
-            score -= 15
-        elif high_risk_file_count >= 10:
-            score -= 8
-
-        score = round(max(0.0, min(100.0, score)), 2)
-
-        def _gate(name: str, status: str, detail: str) -> Dict[str, str]:
-            return {"name": name, "status": status, "detail": detail}
-
-        gates = [
-            _gate(
+        score = _readiness_score(
+            base_score,
+            severity_counts["high"],
+            severity_counts["medium"],
+            severity_counts["low"],
+            has_tests,
+            has_ci,
+            bus_factor,
+            high_risk_file_count,
+        )
+
+        delivery_reliability = dimensions["delivery_reliability"]
+        gate_rows = (
+            (
                 "Test Signal",
-                "pass" if engineering_signals.get("has_tests") else "fail",
-                "Tests detected" if engineering_signals.get("has_tests") else "No clear test directory detected",
+                "pass" if has_tests else "fail",
+                "Tests detected" if has_tests else "No clear test directory detected",
             ),
-            _gate(
+            (
                 "CI Pipeline",
-                "pass" if engineering_signals.get("has_ci") else "fail",
-                "CI workflow detected" if engineering_signals.get("has_ci") else "No CI workflow detected",
+                "pass" if has_ci else "fail",
+                "CI workflow detected" if has_ci else "No CI workflow detected",
             ),
-            _gate(
+            (
                 "Ownership Resilience",
                 "pass" if bus_factor >= 3 else "warn" if bus_factor == 2 else "fail",
                 f"Bus factor(50%) = {bus_factor}",
             ),
-            _gate(
+            (
                 "Complexity Pressure",
                 "pass" if high_risk_file_count <= 5 else "warn" if high_risk_file_count <= 15 else "fail",
                 f"{high_risk_file_count} high-risk files",
             ),
-            _gate(
+            (
                 "Delivery Reliability",
-                "pass"
-                if float(dimensions.get("delivery_reliability", 0) or 0) >= 75
-                else "warn"
-                if float(dimensions.get("delivery_reliability", 0) or 0) >= 55
-                else "fail",
-                f"Score {round(float(dimensions.get('delivery_reliability', 0) or 0), 2)}",
+                "pass" if delivery_reliability >= 75 else "warn" if delivery_reliability >= 55 else "fail",
+                f"Score {_r2(delivery_reliability)}",
             ),
-        ]
+        )
+        gates = [{"name": name, "status": status, "detail": detail} for name, status, detail in gate_rows]
 
         blockers = [flag.get("message", "") for flag in risk_flags if flag.get("severity") == "high"]
         blockers += [gate["name"] + ": " + gate["detail"] for gate in gates if gate["status"] == "fail"]
         blockers = [b for b in blockers if b][:8]
 
-        if score >= 85:
-            tier = "ready"
-            recommendation = "Release posture is strong. Maintain current guardrails and monitor regressions."
-        elif score >= 70:
-            tier = "stabilizing"
-            recommendation = "Near-ready. Address failing gates before broad rollout."
-        elif score >= 55:
-            tier = "hardening"
-            recommendation = "Needs hardening. Prioritize tests/CI and ownership resilience."
-        else:
-            tier = "not_ready"
-            recommendation = "Block release. Resolve critical risk flags and failing quality gates."
+        tier_idx = bisect_right(_READINESS_THRESHOLDS, score)
+        tier = _READINESS_TIERS[tier_idx]
+        recommendation = _READINESS_RECOMMENDATIONS[tier_idx]
 
         recommendations = [
             recommendation,
@@ -948,14 +1470,16 @@ class InsightService:
         complexity_profile: Dict[str, Any],
     ) -> Dict[str, Any]:
         badges: List[Dict[str, Any]] = []
-        delivery_reliability = float(health_scorecard.get("dimensions", {}).get("delivery_reliability", 0) or 0)
-        ownership_resilience = float(health_scorecard.get("dimensions", {}).get("ownership_resilience", 0) or 0)
-        complexity_health = float(health_scorecard.get("dimensions", {}).get("complexity_health", 0) or 0)
-        night_ratio = float(habits.get("night_commit_ratio", 0) or 0)
-        total_commits = int(summary.get("total_commits", 0) or 0)
-        avg_changes = float(summary.get("avg_changes_per_commit", 0) or 0)
-        top_share = float(summary.get("top_contributor_share_percent", 0) or 0)
-        high_risk_files = int(complexity_profile.get("high_risk_file_count", 0) or 0)
+        # Inputs are assembled by build_insights from already-typed values.
+        dimensions = health_scorecard["dimensions"]
+        delivery_reliability = dimensions["delivery_reliability"]
+        ownership_resilience = dimensions["ownership_resilience"]
+        complexity_health = dimensions["complexity_health"]
+        night_ratio = habits["night_commit_ratio"]
+        total_commits = summary["total_commits"]
+        avg_changes = summary["avg_changes_per_commit"]
+        top_share = summary["top_contributor_share_percent"]
+        high_risk_files = complexity_profile["high_risk_file_count"]
 
         def add_badge(name: str, tier: str, confidence: float, reason: str):
             badges.append(
@@ -1028,11 +1552,11 @@ class InsightService:
             add_badge(
                 "Emerging Codebase",
                 "emerging",
-                max(30, health_scorecard.get("overall_score", 0)),
+                max(30, health_scorecard["overall_score"]),
                 "Repository signals are still forming; more history will sharpen characterization.",
             )
 
-        badges = sorted(badges, key=lambda x: x["confidence"], reverse=True)[:6]
+        badges = heapq.nlargest(6, badges, key=itemgetter("confidence"))
         primary = badges[0]["name"]
         storyline = f"{primary} with {len(badges)} detected engineering archetype signal(s)."
         return {
@@ -1041,11 +1565,11 @@ class InsightService:
             "storyline": storyline,
         }
 
-    def _anomaly_detective(self, commits: List[Dict[str, Any]]) -> Dict[str, Any]:
-        ordered = sorted(
-            [x for x in commits if x.get("committed_at")],
-            key=lambda x: x["committed_at"],
-        )
+    def _anomaly_detective(
+        self,
+        ordered: List[Dict[str, Any]],
+        commit_sizes: List[int],
+    ) -> Dict[str, Any]:
         if not ordered:
             return {
                 "risk_index": 0,
@@ -1056,22 +1580,10 @@ class InsightService:
                 "recommended_checks": ["No anomalies available without commit history."],
             }
 
-        commit_sizes = sorted(
-            int(c.get("insertions", 0) or 0) + int(c.get("deletions", 0) or 0)
-            for c in ordered
-        )
-        files_changed = sorted(int(c.get("files_changed", 0) or 0) for c in ordered)
-        p90_changes = self._percentile(commit_sizes, 90)
-        p95_changes = self._percentile(commit_sizes, 95)
-        p95_files = self._percentile(files_changed, 95)
-
-        daily_buckets: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
-        for commit in ordered:
-            day_key = commit["committed_at"].date().isoformat()
-            daily_buckets[day_key].append(commit)
+        files_changed = [c["files_changed"] for c in ordered]
+        p90_changes, p95_changes = self._percentiles(commit_sizes, (90, 95))
+        p95_files = self._percentile_unsorted(files_changed, 95)
 
-        daily_commit_counts = [len(items) for items in daily_buckets.values()]
-        median_daily_commits = float(median(daily_commit_counts)) if daily_commit_counts else 1.0
         anomalies: List[Dict[str, Any]] = []
 
         def _add_anomaly(
@@ -1092,38 +1604,69 @@ class InsightService:
                 "date": day or (commit["committed_at"].date().isoformat() if commit else None),
             }
             if commit:
-                item["commit_sha"] = str(commit.get("sha", ""))[:10]
+                item["commit_sha"] = commit["sha"][:10]
                 item["author"] = commit.get("author_name") or "unknown"
-                item["changes"] = int(commit.get("insertions", 0) or 0) + int(commit.get("deletions", 0) or 0)
+                item["changes"] = commit["changes"]
             anomalies.append(item)
 
+        # Thresholds depend only on the distribution, not the commit; resolve them once.
+        mega_threshold = max(500, p95_changes * 1.8)
+        mega_high_threshold = max(1200, p95_changes * 2.3)
+        off_hours_threshold = max(220, p90_changes * 1.35)
+        wide_threshold = max(35, p95_files * 1.5)
+        stability_threshold = max(80, p90_changes * 0.75)
+        p90_divisor = max(1.0, p90_changes + 1)
+
+        # Per-day commit count and largest commit, gathered in the same walk; the
+        # first commit wins ties, as max() over the day's commits would.
+        day_counts: Dict[str, int] = {}
+        day_largest: Dict[str, Dict[str, Any]] = {}
+        current_date = None
+        day_key = ""
+        # Long gaps are also spotted in this walk but emitted after the burst days,
+        # keeping the original anomaly order.
+        long_gap = timedelta(days=14)
+        gap_hits: List[tuple[Dict[str, Any], int]] = []
+        previous_dt = None
         for commit in ordered:
             dt = commit["committed_at"]
-            message = str(commit.get("message", "")).lower()
-            changes = int(commit.get("insertions", 0) or 0) + int(commit.get("deletions", 0) or 0)
-            files = int(commit.get("files_changed", 0) or 0)
-
-            if changes >= max(500, p95_changes * 1.8):
+            changes = commit["changes"]
+            files = commit["files_changed"]
+
+            if previous_dt is not None and dt - previous_dt >= long_gap:
+                gap_hits.append((commit, (dt - previous_dt).days))
+            previous_dt = dt
+
+            day = dt.date()
+            if day != current_date:
+                current_date = day
+                day_key = day.isoformat()
+            seen_today = day_counts.get(day_key, 0)
+            day_counts[day_key] = seen_today + 1
+            if not seen_today or changes > day_largest[day_key]["changes"]:
+                day_largest[day_key] = commit
+
+            if changes >= mega_threshold:
                 _add_anomaly(
                     anomaly_type="mega_commit",
-                    severity="high" if changes >= max(1200, p95_changes * 2.3) else "medium",
-                    score=min(100.0, 55 + (changes / max(1.0, p90_changes + 1)) * 16),
+                    severity="high" if changes >= mega_high_threshold else "medium",
+                    score=min(100.0, 55 + (changes / p90_divisor) * 16),
                     headline="Large commit spike",
                     detail=f"Commit changed {changes} lines in one push.",
                     commit=commit,
                 )
 
-            if dt.hour < 5 and changes >= max(220, p90_changes * 1.35):
+            if dt.hour < 5 and changes >= off_hours_threshold:
                 _add_anomaly(
                     anomaly_type="off_hours_heavy_change",
                     severity="medium",
-                    score=min(100.0, 45 + (changes / max(1.0, p90_changes + 1)) * 10),
+                    score=min(100.0, 45 + (changes / p90_divisor) * 10),
                     headline="Large off-hours commit",
                     detail=f"Heavy change landed at {dt.hour:02d}:00, increasing review risk.",
                     commit=commit,
                 )
 
-            if files >= max(35, p95_files * 1.5):
+            if files >= wide_threshold:
                 _add_anomaly(
                     anomaly_type="wide_surface_area",
                     severity="high" if files >= 80 else "medium",
@@ -1133,7 +1676,7 @@ class InsightService:
                     commit=commit,
                 )
 
-            if ("revert" in message or "hotfix" in message) and changes >= max(80, p90_changes * 0.75):
+            if commit["is_stability"] and changes >= stability_threshold:
                 _add_anomaly(
                     anomaly_type="stability_event",
                     severity="medium",
@@ -1143,45 +1686,55 @@ class InsightService:
                     commit=commit,
                 )
 
-        for day, day_commits in daily_buckets.items():
-            if len(day_commits) >= max(8, int(math.ceil(median_daily_commits * 3))):
-                largest_commit = max(
-                    day_commits,
-                    key=lambda x: int(x.get("insertions", 0) or 0) + int(x.get("deletions", 0) or 0),
-                )
+        median_daily_commits = float(median(day_counts.values())) if day_counts else 1.0
+        burst_threshold = max(8, int(math.ceil(median_daily_commits * 3)))
+        for day, commits_on_day in day_counts.items():
+            if commits_on_day >= burst_threshold:
                 _add_anomaly(
                     anomaly_type="daily_burst",
                     severity="medium",
-                    score=min(100.0, 40 + len(day_commits) * 4.5),
+                    score=min(100.0, 40 + commits_on_day * 4.5),
                     headline="Burst activity day",
-                    detail=f"{len(day_commits)} commits landed on {day}, far above baseline cadence.",
-                    commit=largest_commit,
+                    detail=f"{commits_on_day} commits landed on {day}, far above baseline cadence.",
+                    commit=day_largest[day],
                     day=day,
                 )
 
-        for previous, current in zip(ordered, ordered[1:]):
-            gap_days = (current["committed_at"] - previous["committed_at"]).days
-            if gap_days >= 14:
-                _add_anomaly(
-                    anomaly_type="long_gap",
-                    severity="low" if gap_days < 30 else "medium",
-                    score=min(100.0, 20 + gap_days * 1.2),
-                    headline="Long inactivity gap",
-                    detail=f"Detected a {gap_days}-day delivery gap between commits.",
-                    commit=current,
-                )
+        for current, gap_days in gap_hits:
+            _add_anomaly(
+                anomaly_type="long_gap",
+                severity="low" if gap_days < 30 else "medium",
+                score=min(100.0, 20 + gap_days * 1.2),
+                headline="Long inactivity gap",
+                detail=f"Detected a {gap_days}-day delivery gap between commits.",
+                commit=current,
+            )
 
         severity_rank = {"high": 3, "medium": 2, "low": 1}
-        anomalies = sorted(
-            anomalies,
-            key=lambda item: (severity_rank.get(str(item.get("severity")), 0), float(item.get("score", 0))),
-            reverse=True,
-        )
 
-        type_counter = Counter(str(item.get("type", "unknown")) for item in anomalies)
-        high_count = sum(1 for item in anomalies if item.get("severity") == "high")
-        medium_count = sum(1 for item in anomalies if item.get("severity") == "medium")
-        low_count = sum(1 for item in anomalies if item.get("severity") == "low")
+        def _rank(item: Dict[str, Any]) -> tuple[int, float]:
+            return severity_rank.get(item["severity"], 0), item["score"]
+
+        highlights = heapq.nlargest(15, anomalies, key=_rank)
+
+        # Types are counted over the unsorted list, then ordered by count and, on ties,
+        # by their best-ranked anomaly: the order most_common() gave over the sorted list.
+        type_counter: Counter[str] = Counter()
+        severity_counter: Counter[str] = Counter()
+        type_best: Dict[str, tuple] = {}
+        for idx, item in enumerate(anomalies):
+            anomaly_type = item["type"]
+            type_counter[anomaly_type] += 1
+            severity_counter[item["severity"]] += 1
+            best = (*_rank(item), -idx)
+            if best > type_best.get(anomaly_type, ()):
+                type_best[anomaly_type] = best
+        type_counts = sorted(
+            type_counter.items(), key=lambda kv: (kv[1], type_best[kv[0]]), reverse=True
+        )
+        high_count = severity_counter["high"]
+        medium_count = severity_counter["medium"]
+        low_count = severity_counter["low"]
         anomaly_rate = round((len(anomalies) / max(1, len(ordered))) * 100, 2)
         risk_index = round(
             _clamp(
@@ -1207,10 +1760,10 @@ class InsightService:
             "anomaly_count": len(anomalies),
             "anomaly_rate_percent": anomaly_rate,
             "counts_by_type": [
-                {"type": anomaly_type, "label": anomaly_type.replace("_", " "), "count": count}
-                for anomaly_type, count in type_counter.most_common()
+                {"type": anomaly_type, "label": _ANOMALY_LABELS[anomaly_type], "count": count}
+                for anomaly_type, count in type_counts
             ],
-            "highlights": anomalies[:15],
+            "highlights": highlights,
             "recommended_checks": recommendations,
         }
 
@@ -1218,7 +1771,10 @@ class InsightService:
         self,
         top_contributors: List[Dict[str, Any]],
         total_commits: int,
+        positive_commit_total: int,
+        positive_contributor_count: int,
     ) -> Dict[str, Any]:
+        """``top_contributors`` may be a ranked prefix; the totals cover every contributor."""
         contributor_rows = []
         for contributor in top_contributors:
             commits_count = _safe_int(contributor.get("commits"), 0)
@@ -1239,22 +1795,27 @@ class InsightService:
                 "scenarios": [],
             }
 
-        effective_total = max(total_commits, sum(item["commits"] for item in contributor_rows))
-        baseline_bus_factor = self._bus_factor([item["commits"] for item in contributor_rows])
+        effective_total = max(total_commits, positive_commit_total)
+        # Rows are ranked by commits, so prefix sums give every scenario's removed
+        # total and let the remaining bus factor be found by bisection.
+        commit_prefix = list(accumulate(item["commits"] for item in contributor_rows))
+        baseline_bus_factor = self._bus_factor_from_prefix(commit_prefix, 0, positive_commit_total)
         top_share = round((contributor_rows[0]["commits"] / max(1, effective_total)) * 100, 2)
         max_removals = min(5, len(contributor_rows))
         scenarios = []
 
         for removed_count in range(1, max_removals + 1):
             removed = contributor_rows[:removed_count]
-            remaining = contributor_rows[removed_count:]
-            removed_commits = sum(item["commits"] for item in removed)
+            has_remaining = removed_count < len(contributor_rows)
+            removed_commits = commit_prefix[removed_count - 1]
             remaining_commits = max(0, effective_total - removed_commits)
             coverage_lost_percent = round((removed_commits / max(1, effective_total)) * 100, 2)
-            remaining_bus_factor = self._bus_factor([item["commits"] for item in remaining])
+            remaining_bus_factor = self._bus_factor_from_prefix(
+                commit_prefix, removed_count, positive_commit_total - removed_commits
+            )
             top_remaining_share = (
-                round((remaining[0]["commits"] / max(1, remaining_commits)) * 100, 2)
-                if remaining
+                round((contributor_rows[removed_count]["commits"] / max(1, remaining_commits)) * 100, 2)
+                if has_remaining
                 else 100.0
             )
             resilience_score = round(
@@ -1280,10 +1841,11 @@ class InsightService:
                 else "low"
             )
 
-            per_person_capacity = (remaining_commits / max(1, len(remaining))) if remaining else 0.0
+            remaining_people = positive_contributor_count - removed_count
+            per_person_capacity = (remaining_commits / max(1, remaining_people)) if has_remaining else 0.0
             recovery_days = (
                 int(round(max(2.0, (removed_commits / max(1.0, per_person_capacity)) * 3.0)))
-                if remaining
+                if has_remaining
                 else 30
             )
 
@@ -1341,9 +1903,11 @@ class InsightService:
             }
 
         recent_weeks = weeks[-8:]
-        commit_series = [int(item.get("commits", 0) or 0) for item in recent_weeks]
-        avg_commits = sum(commit_series) / max(1, len(commit_series))
-        variance = sum((value - avg_commits) ** 2 for value in commit_series) / max(1, len(commit_series))
+        # Digest weeks always carry an int commit count.
+        commit_series = [item["commits"] for item in recent_weeks]
+        series_len = max(1, len(commit_series))
+        avg_commits = sum(commit_series) / series_len
+        variance = sum((value - avg_commits) ** 2 for value in commit_series) / series_len
         volatility = math.sqrt(variance)
         volatility_percent = (volatility / avg_commits) * 100 if avg_commits > 0 else 0.0
 
@@ -1351,8 +1915,9 @@ class InsightService:
         trend = weekly_digest.get("trend") or {}
         momentum = str(trend.get("momentum", "stable"))
         night_ratio = float(latest.get("night_commit_ratio", 0) or 0)
-        high_risk_flags = sum(1 for flag in risk_flags if flag.get("severity") == "high")
-        medium_risk_flags = sum(1 for flag in risk_flags if flag.get("severity") == "medium")
+        flag_severities = Counter(flag.get("severity") for flag in risk_flags)
+        high_risk_flags = flag_severities["high"]
+        medium_risk_flags = flag_severities["medium"]
         readiness_score = float(
             release_readiness.get("score", health_scorecard.get("overall_score", 0)) or 0
         )
@@ -1383,6 +1948,7 @@ class InsightService:
         slope = 1.04 if outlook == "sunny" else 0.99 if outlook == "cloudy" else 0.93
         spread = max(2, int(round(max(volatility, base_commits * 0.15))))
 
+        risk_level = "high" if outlook == "stormy" else "medium" if outlook == "cloudy" else "low"
         projected_weeks = []
         for offset in range(1, 4):
             center = max(1, int(round(base_commits * (slope**offset))))
@@ -1393,7 +1959,7 @@ class InsightService:
                     "expected_min_commits": max(0, center - spread),
                     "expected_max_commits": center + spread,
                     "expected_mid_commits": center,
-                    "risk_level": "high" if outlook == "stormy" else "medium" if outlook == "cloudy" else "low",
+                    "risk_level": risk_level,
                 }
             )
 
@@ -1407,18 +1973,13 @@ class InsightService:
         signals = [
             {"name": "Momentum", "value": momentum},
             {"name": "Volatility (%)", "value": round(volatility_percent, 2)},
-            {"name": "Night Commit Ratio (%)", "value": round(night_ratio, 2)},
-            {"name": "Anomaly Risk Index", "value": round(anomaly_risk, 2)},
-            {"name": "Release Readiness", "value": round(readiness_score, 2)},
+            # The remaining inputs are already rounded to 2dp by their producers.
+            {"name": "Night Commit Ratio (%)", "value": night_ratio},
+            {"name": "Anomaly Risk Index", "value": anomaly_risk},
+            {"name": "Release Readiness", "value": readiness_score},
         ]
 
-        summary = (
-            "Stable trajectory with low operational pressure."
-            if outlook == "sunny"
-            else "Mixed signals; prioritize risk controls while maintaining velocity."
-            if outlook == "cloudy"
-            else "Elevated delivery pressure forecasted; reduce risk before scaling release pace."
-        )
+        summary = _FORECAST_SUMMARIES[outlook]
 
         return {
             "outlook": outlook,
@@ -1440,18 +2001,7 @@ class InsightService:
     ) -> Dict[str, Any]:
         candidates = (blast_radius.get("candidates") or [])[:8]
         if not candidates and hotspots:
-            candidates = [
-                {
-                    "path": item.get("path"),
-                    "directory": (str(item.get("path"))).rsplit("/", 1)[0] if "/" in str(item.get("path")) else ".",
-                    "estimated_neighbor_files": 8,
-                    "complexity": float(item.get("cyclomatic_complexity", 0) or 0),
-                    "size_bytes": 0,
-                    "impact_score": float(item.get("cyclomatic_complexity", 0) or 0) * 2.8,
-                    "risk_tier": "high" if float(item.get("cyclomatic_complexity", 0) or 0) >= 18 else "medium",
-                }
-                for item in hotspots[:8]
-            ]
+            candidates = [_materialize_hotspot_candidate(item) for item in hotspots[:8]]
 
         reviewers = [
             str(item.get("name") or item.get("email") or "unknown")
@@ -1461,77 +2011,67 @@ class InsightService:
         if not reviewers:
             reviewers = ["module owner", "tech lead"]
 
+        has_ci = engineering_signals.get("has_ci")
+
+        # Reviewer rotations depend only on idx % len(reviewers), so they are sliced up front.
+        reviewer_count = len(reviewers)
+        doubled_reviewers = reviewers + reviewers
+        window = min(3, reviewer_count)
+        rotations = [doubled_reviewers[i:i + window] for i in range(reviewer_count)]
+
+        # Numeric columns are pulled out once, then the risk scores are computed column-wise.
+        complexities = [_get_float(c, "complexity", "cyclomatic_complexity") for c in candidates]
+        impact_scores = [_get_float(c, "impact_score") for c in candidates]
+        neighbor_counts = [_get_int(c, "estimated_neighbor_files", default=1) for c in candidates]
+        sizes = [_get_int(c, "size_bytes") for c in candidates]
+        # Locals for the per-candidate comprehensions below.
+        clamp = _clamp
+        log2 = math.log2
+        risk_scores = [
+            round(clamp(impact + complexity * 0.9 + log2(max(2, neighbors)) * 3, 0.0, 100.0), 2)
+            for impact, complexity, neighbors in zip(impact_scores, complexities, neighbor_counts)
+        ]
+
         scenarios = []
-        for idx, candidate in enumerate(candidates):
+        add_scenario = scenarios.append
+        for idx, (candidate, complexity, neighbor_files, size_bytes, risk_score) in enumerate(
+            zip(candidates, complexities, neighbor_counts, sizes, risk_scores)
+        ):
             path = str(candidate.get("path", "unknown"))
-            complexity = float(candidate.get("complexity", candidate.get("cyclomatic_complexity", 0)) or 0)
-            impact_score = float(candidate.get("impact_score", 0) or 0)
-            neighbor_files = int(candidate.get("estimated_neighbor_files", 1) or 1)
-            size_bytes = int(candidate.get("size_bytes", 0) or 0)
-            risk_score = round(
-                _clamp(impact_score + complexity * 0.9 + math.log2(max(2, neighbor_files)) * 3, 0.0, 100.0),
-                2,
-            )
 
-            failure_modes = []
-            if complexity >= 20:
-                failure_modes.append(
-                    {
-                        "mode": "branch_logic_regression",
-                        "label": "Branch-heavy logic may regress on edge paths.",
-                        "probability_percent": round(_clamp(42 + complexity * 1.1, 0.0, 95.0), 2),
-                    }
-                )
-            if neighbor_files >= 40:
-                failure_modes.append(
-                    {
-                        "mode": "integration_side_effect",
-                        "label": "Wide module surface increases hidden integration side-effects.",
-                        "probability_percent": round(_clamp(35 + neighbor_files * 0.6, 0.0, 95.0), 2),
-                    }
-                )
-            if size_bytes >= 250000:
-                failure_modes.append(
-                    {
-                        "mode": "review_blind_spot",
-                        "label": "Large artifact size can reduce review depth and miss subtle defects.",
-                        "probability_percent": round(_clamp(28 + math.log2(size_bytes + 1) * 4, 0.0, 90.0), 2),
-                    }
-                )
-            if risk_score >= 70:
-                failure_modes.append(
-                    {
-                        "mode": "rollback_likelihood",
-                        "label": "High blast-radius score indicates elevated rollback risk.",
-                        "probability_percent": round(_clamp(30 + risk_score * 0.5, 0.0, 95.0), 2),
-                    }
-                )
+            failure_modes = [
+                {
+                    "mode": mode,
+                    "label": label,
+                    "probability_percent": round(
+                        clamp(probability(complexity, neighbor_files, size_bytes, risk_score), 0.0, cap), 2
+                    ),
+                }
+                for mode, label, applies, probability, cap in _FAILURE_MODE_SPECS
+                if applies(complexity, neighbor_files, size_bytes, risk_score)
+            ]
             if not failure_modes:
+                mode, label, _, probability, cap = _FALLBACK_FAILURE_MODE
                 failure_modes.append(
                     {
-                        "mode": "localized_regression",
-                        "label": "Localized functional regression remains possible.",
-                        "probability_percent": round(_clamp(18 + risk_score * 0.25, 0.0, 70.0), 2),
+                        "mode": mode,
+                        "label": label,
+                        "probability_percent": round(
+                            _clamp(probability(complexity, neighbor_files, size_bytes, risk_score), 0.0, cap), 2
+                        ),
                     }
                 )
 
-            mitigations = [
-                "Add targeted regression tests for changed interfaces and edge paths.",
-                "Assign at least one reviewer with recent ownership in this directory.",
-                "Use a small-scope rollout plan with measurable rollback signals.",
-            ]
+            mitigations = _BASE_MITIGATIONS
             if risk_score >= 70:
-                mitigations.append("Deploy behind feature flags or staged canary gates.")
-            if not engineering_signals.get("has_ci"):
-                mitigations.append("Run manual smoke tests until CI coverage is available.")
+                mitigations += _FLAG_MITIGATION
+            if not has_ci:
+                mitigations += _SMOKE_TEST_MITIGATION
 
-            suggested_reviewers = [
-                reviewers[(idx + offset) % len(reviewers)]
-                for offset in range(min(3, len(reviewers)))
-            ]
+            suggested_reviewers = rotations[idx % reviewer_count]
             estimated_review_hours = int(round(max(2.0, risk_score / 18 + len(failure_modes))))
 
-            scenarios.append(
+            add_scenario(
                 {
                     "scenario_id": f"pm-{idx + 1}",
                     "target_path": path,
@@ -1540,18 +2080,22 @@ class InsightService:
                     "risk_tier": candidate.get("risk_tier", "medium"),
                     "estimated_review_hours": estimated_review_hours,
                     "failure_modes": failure_modes,
-                    "mitigations": mitigations[:5],
+                    "mitigations": mitigations,
                     "suggested_reviewers": suggested_reviewers,
                 }
             )
 
-        portfolio_risk = round(
-            sum(item["risk_score"] for item in scenarios) / max(1, len(scenarios)),
-            2,
-        )
+        total_risk = 0.0
+        high_risk_targets = 0
+        for item in scenarios:
+            score = item["risk_score"]
+            total_risk += score
+            if score >= 70:
+                high_risk_targets += 1
+        portfolio_risk = round(total_risk / max(1, len(scenarios)), 2)
         return {
             "portfolio_risk_score": portfolio_risk,
-            "high_risk_targets": sum(1 for item in scenarios if item["risk_score"] >= 70),
+            "high_risk_targets": high_risk_targets,
             "scenarios": scenarios,
         }
 
@@ -1564,18 +2108,19 @@ class InsightService:
         release_readiness: Dict[str, Any],
         risk_flags: List[Dict[str, Any]],
     ) -> Dict[str, Any]:
-        briefs: List[Dict[str, Any]] = []
+        # Briefs land in their priority bucket, so concatenating P0/P1/P2 yields the ranked order.
+        buckets: Dict[str, List[Dict[str, Any]]] = {"P0": [], "P1": [], "P2": []}
 
         def add_brief(
             priority: str,
             title: str,
             owner_role: str,
             why_now: str,
-            first_steps: List[str],
+            first_steps: Tuple[str, ...],
             success_metric: str,
             timeline_days: int,
         ):
-            briefs.append(
+            buckets[priority].append(
                 {
                     "priority": priority,
                     "title": title,
@@ -1589,17 +2134,13 @@ class InsightService:
 
         top_scenario = (pre_mortem.get("scenarios") or [{}])[0]
         if top_scenario and top_scenario.get("target_path"):
-            top_risk = float(top_scenario.get("risk_score", 0) or 0)
+            top_risk = _get_float(top_scenario, "risk_score")
             add_brief(
                 priority="P0" if top_risk >= 80 else "P1",
                 title=f"Harden hotspot: {top_scenario.get('target_path')}",
                 owner_role="Module owner + QA partner",
                 why_now=f"Pre-mortem risk score is {round(top_risk, 2)} with elevated blast radius.",
-                first_steps=[
-                    "Add boundary tests and a rollback validation checklist for this path.",
-                    "Break upcoming PRs into isolated slices limited to one risk mode.",
-                    "Gate merge on two approvals including one reviewer outside the primary owner.",
-                ],
+                first_steps=_HOTSPOT_FIRST_STEPS,
                 success_metric="Reduce hotspot risk score by >=15 points over the next two runs.",
                 timeline_days=10,
             )
@@ -1607,104 +2148,71 @@ class InsightService:
         shock_scenarios = bus_factor_shock.get("scenarios") or []
         weakest_shock = min(shock_scenarios, key=lambda x: float(x.get("resilience_score", 0))) if shock_scenarios else None
         if weakest_shock:
-            resilience = float(weakest_shock.get("resilience_score", 0) or 0)
+            resilience = _get_float(weakest_shock, "resilience_score")
             removed = ", ".join((weakest_shock.get("removed_contributors") or [])[:2]) or "core owners"
             add_brief(
                 priority="P0" if resilience < 45 else "P1",
                 title="Reduce ownership concentration risk",
                 owner_role="Engineering manager + tech leads",
                 why_now=f"Shock test drops resilience to {round(resilience, 2)} when {removed} are unavailable.",
-                first_steps=[
-                    "Create a two-week ownership rotation for top two critical directories.",
-                    "Require shadow reviewers from a second team on high-risk PRs.",
-                    "Document runbooks for the top three blast-radius modules.",
-                ],
+                first_steps=_OWNERSHIP_FIRST_STEPS,
                 success_metric="Increase shock-test resilience score to >=65 in the next analysis cycle.",
                 timeline_days=14,
             )
 
-        anomaly_risk = float(anomaly_report.get("risk_index", 0) or 0)
+        anomaly_risk = _get_float(anomaly_report, "risk_index")
         if anomaly_risk >= 35:
             add_brief(
                 priority="P1",
                 title="Normalize anomalous delivery patterns",
                 owner_role="Release captain",
                 why_now=f"Anomaly risk index is {round(anomaly_risk, 2)} with unusual commit patterns.",
-                first_steps=[
-                    "Flag mega-commit and wide-surface changes for synchronous review before merge.",
-                    "Add PR template checks for off-hours high-change submissions.",
-                    "Run weekly anomaly review in sprint quality sync.",
-                ],
+                first_steps=_ANOMALY_FIRST_STEPS,
                 success_metric="Cut anomaly rate by 30% while maintaining weekly throughput.",
                 timeline_days=7,
             )
 
         outlook = str(engineering_forecast.get("outlook", "unknown"))
-        forecast_pressure = float(engineering_forecast.get("pressure_index", 0) or 0)
+        forecast_pressure = _get_float(engineering_forecast, "pressure_index")
         if outlook in {"cloudy", "stormy"}:
             add_brief(
                 priority="P1" if outlook == "cloudy" else "P0",
                 title="Stabilize delivery weather",
                 owner_role="Tech lead",
                 why_now=f"Forecast outlook is {outlook.upper()} with pressure index {round(forecast_pressure, 2)}.",
-                first_steps=[
-                    "Limit concurrent high-risk changes per sprint lane.",
-                    "Allocate explicit time for debt and test reinforcement in next iteration.",
-                    "Track review lag and incident risk as release guardrails.",
-                ],
+                first_steps=_WEATHER_FIRST_STEPS,
                 success_metric="Move forecast outlook to SUNNY/CLOUDY with pressure index <45.",
                 timeline_days=10,
             )
 
         high_risk_flags = [flag.get("message", "") for flag in risk_flags if flag.get("severity") == "high"]
-        readiness_score = float(release_readiness.get("score", 0) or 0)
+        readiness_score = _get_float(release_readiness, "score")
         if readiness_score < 80 or high_risk_flags:
             add_brief(
                 priority="P1" if readiness_score >= 65 else "P0",
                 title="Raise release confidence",
                 owner_role="Release manager",
                 why_now=f"Release readiness score is {round(readiness_score, 2)} and needs hardening.",
-                first_steps=[
-                    "Close failing release gates and unresolved high-severity risk flags.",
-                    "Add a pre-release dry run with rollback rehearsal.",
-                    "Publish a release checklist owned by cross-functional reviewers.",
-                ],
+                first_steps=_READINESS_FIRST_STEPS,
                 success_metric="Improve readiness score to >=85 with zero failing gates.",
                 timeline_days=14,
             )
 
-        if not briefs:
+        if not any(buckets.values()):
             add_brief(
                 priority="P2",
                 title="Keep healthy engineering cadence",
                 owner_role="Team leads",
                 why_now="Current indicators are stable; preserve reliability as velocity scales.",
-                first_steps=[
-                    "Continue weekly quality and ownership reviews.",
-                    "Monitor hotspot score drift and forecast pressure.",
-                    "Capture learnings from major PRs in lightweight runbooks.",
-                ],
+                first_steps=_CADENCE_FIRST_STEPS,
                 success_metric="Maintain health and readiness scores above 80.",
                 timeline_days=14,
             )
 
-        priority_rank = {"P0": 0, "P1": 1, "P2": 2}
-        briefs = sorted(briefs, key=lambda item: priority_rank.get(item["priority"], 99))[:6]
+        briefs = (buckets["P0"] + buckets["P1"] + buckets["P2"])[:6]
         top_priority = briefs[0] if briefs else None
-        roadmap = [
-            {
-                "window": "Days 1-3",
-                "focus": briefs[0]["title"] if len(briefs) > 0 else "Stabilize top risk",
-            },
-            {
-                "window": "Days 4-7",
-                "focus": briefs[1]["title"] if len(briefs) > 1 else "Improve ownership resilience",
-            },
-            {
-                "window": "Week 2",
-                "focus": briefs[2]["title"] if len(briefs) > 2 else "Lift readiness score",
-            },
-        ]
+        focuses = [brief["title"] for brief in briefs[:3]] + list(_ROADMAP_DEFAULT_FOCUS[len(briefs):])
+        roadmap = [{"window": window, "focus": focus} for window, focus in zip(_ROADMAP_WINDOWS, focuses)]
         narrative = (
             f"Top action: {top_priority['title']} ({top_priority['priority']})"
             if top_priority
@@ -1712,7 +2220,7 @@ class InsightService:
         )
 
         return {
-            "generated_at": datetime.utcnow().isoformat() + "Z",
+            "generated_at": None,  # stamped by build_insights
             "top_priority": top_priority,
             "briefs": briefs,
             "roadmap": roadmap,
@@ -1720,54 +2228,12 @@ class InsightService:
         }
 
     def _executive_summary(self, insights: Dict[str, Any]) -> List[str]:
-        summary = insights["summary"]
-        habits = insights["development_habits"]
-        team = insights["team_dynamics"]
-        complexity = insights["complexity_profile"]
-        structure = insights["repository_structure"]
-        quality = insights["insight_quality"]
-        collaboration = insights.get("collaboration_story", {})
-        readiness = insights.get("release_readiness", {})
-        shock_test = insights.get("bus_factor_shock_test", {})
-        forecast = insights.get("engineering_weather_forecast", {})
-        anomalies = insights.get("anomaly_detective", {})
-        action_briefs = insights.get("ai_action_briefs", {})
-
-        lines = [
-            f"Analyzed {summary['total_commits_analyzed']} commits across {summary['total_contributors']} contributors.",
-            f"Top contributor owns {team['top_contributor_commit_share_percent']}% of commits; bus factor(50%) is {team['bus_factor_50_percent']}.",
-            f"Night-time commit ratio is {habits['night_commit_ratio']}%, revealing delivery-window habits.",
-            f"Detected {complexity['high_risk_file_count']} high-risk files by cyclomatic complexity.",
-            f"Repository shape: {structure['total_files']} files across {structure['total_directories']} directories (depth {structure['max_depth']}).",
-            f"Insight confidence score: {quality['confidence_score']}/100.",
-        ]
-        if readiness:
-            lines.append(
-                f"Release readiness is {readiness.get('score', 0)}/100 ({str(readiness.get('tier', 'unknown')).upper()})."
-            )
-        if collaboration:
-            lines.append(
-                f"Collaboration index is {collaboration.get('collaboration_index', 0)} with {collaboration.get('metrics', {}).get('handoff_events', 0)} cross-author handoffs."
-            )
-        if shock_test:
-            lines.append(
-                f"Bus-factor shock resilience is {shock_test.get('resilience_score', 0)} with top-share concentration at {shock_test.get('top_contributor_share_percent', 0)}%."
-            )
-        if forecast:
-            lines.append(
-                f"Engineering weather outlook is {str(forecast.get('outlook', 'unknown')).upper()} (pressure index {forecast.get('pressure_index', 0)})."
-            )
-        if anomalies:
-            lines.append(
-                f"Anomaly detective flagged {anomalies.get('anomaly_count', 0)} events (risk index {anomalies.get('risk_index', 0)})."
-            )
-        if action_briefs and action_briefs.get("top_priority"):
-            lines.append(
-                f"Top recommended action: {action_briefs.get('top_priority', {}).get('title', 'N/A')}."
-            )
-        if complexity["hotspots"]:
-            top = complexity["hotspots"][0]
-            lines.append(
-                f"Top hotspot: {top.get('path')} (complexity={top.get('cyclomatic_complexity')})."
-            )
+        has_commits = bool(insights["summary"].get("total_commits_analyzed"))
+        lines = [] if has_commits else ["No commits analyzed."]
+        extracted = (
+            (template, extract(data))
+            for section, template, extract, needs_commits in _EXEC_SUMMARY_ROWS
+            if (has_commits or not needs_commits) and (data := insights.get(section))
+        )
+        lines.extend(template.format(*values) for template, values in extracted if values is not None)
         return lines
@@ -3,76 +3,137 @@ Celery tasks for distributed repository analysis
 """
 
 import asyncio
+import heapq
+import os
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from celery import current_task
+from celery.signals import worker_process_init
+from sqlalchemy import select, update
+import orjson
 import structlog
 
+try:
+    # Installed with uvicorn[standard]; unavailable on Windows.
+    import uvloop
+except ImportError:
+    uvloop = None
+
 from app.tasks.celery_app import celery_app
 from app.services.git_service import GitService
 from app.services.ai_service import AIService
 from app.services.complexity_service import ComplexityService
 from app.services.insight_service import InsightService
 from app.core.config import settings
-from app.core.database import AsyncSessionLocal
+from app.core.database import SyncSessionLocal
 from app.models.repository import Repository
 from app.models.analysis import Analysis
-from app.models.commit import Commit
-from app.models.file import File
-from app.models.contributor import Contributor
 from app.core.cache import cache_manager
 from app.core.realtime import publish_progress_event
 
 logger = structlog.get_logger()
-_TASK_LOOP = asyncio.new_event_loop()
-asyncio.set_event_loop(_TASK_LOOP)
 
+# Progress ticks always go to Redis; Postgres is only written on terminal
+# statuses or when the last write for that analysis is older than this.
+PROGRESS_FLUSH_INTERVAL_SECONDS = 2.0
+_TERMINAL_STATUSES = frozenset({"completed", "failed"})
+_last_progress_flush: dict[str, float] = {}
 
-def _run_async(coro):
-    """Run all async task coroutines on a single dedicated loop."""
-    return _TASK_LOOP.run_until_complete(coro)
+# Settings are fixed for the life of a worker, so the insights stage is picked once.
+AI_INSIGHTS_ACTIVE = bool(settings.ENABLE_AI_INSIGHTS and settings.OPENAI_API_KEY)
 
+# One loop per process, created lazily: this module is imported by the prefork
+# parent, and a loop created there must not be inherited by forked children.
+_task_loop: asyncio.AbstractEventLoop | None = None
+_task_loop_pid: int | None = None
 
-@celery_app.task(bind=True, max_retries=3)
+
+def _get_task_loop() -> asyncio.AbstractEventLoop:
+    """Return this process's task loop, creating it on first use after a fork."""
+    global _task_loop, _task_loop_pid
+    pid = os.getpid()
+    if _task_loop is None or _task_loop_pid != pid:
+        _task_loop = uvloop.new_event_loop() if uvloop is not None else asyncio.new_event_loop()
+        _task_loop_pid = pid
+        asyncio.set_event_loop(_task_loop)
+    return _task_loop
+
+
+def _run_async(coro):
+    """Run async cache/pubsub/AI coroutines on a single dedicated loop."""
+    return _get_task_loop().run_until_complete(coro)
+
+
+# Services hold no per-analysis state, so each worker process builds them once and
+# keeps the OpenAI client's connection pool warm across analyses.
+_SERVICE_FACTORIES = {
+    "git": GitService,
+    "complexity": ComplexityService,
+    "insight": InsightService,
+    "ai": AIService,
+}
+_services: dict[str, object] = {}
+
+
+def _service(name: str):
+    """Return this process's shared instance of a pipeline service."""
+    service = _services.get(name)
+    if service is None:
+        service = _services[name] = _SERVICE_FACTORIES[name]()
+    return service
+
+
+@worker_process_init.connect
+def _init_worker_services(**_kwargs):
+    """Build the event loop and pipeline services when a worker process starts."""
+    _get_task_loop()
+    for name in ("git", "complexity", "insight"):
+        _service(name)
+    if AI_INSIGHTS_ACTIVE:
+        _service("ai")
+
+
+# The pipeline runs all four stages, each of which had CELERY_TASK_TIMEOUT as a separate
+# chained task, so it gets its own limit. The soft limit raises inside the running stage,
+# which records the failure and removes its checkout before the hard kill.
+@celery_app.task(
+    bind=True,
+    time_limit=settings.CELERY_PIPELINE_TIMEOUT,
+    soft_time_limit=settings.CELERY_PIPELINE_TIMEOUT - 60,
+)
 def start_repository_analysis(self, analysis_id: str, repository_id: str):
-    """Main analysis task - orchestrates the distributed analysis pipeline"""
-    try:
-        # Update analysis status
-        update_progress(analysis_id, 0, "starting")
-        
-        # Start sub-tasks
-        chain = (
-            analyze_git_data.s(analysis_id, repository_id) |
-            analyze_complexity.s(analysis_id, repository_id) |
-            generate_ai_insights.s(analysis_id, repository_id) |
-            compile_results.s(analysis_id, repository_id)
-        )
-        
-        result = chain.apply_async()
-        
-        logger.info("Analysis pipeline started", analysis_id=analysis_id, task_id=result.id)
-        return result.id
-    except Exception as e:
-        logger.error("Failed to start analysis pipeline", error=str(e), analysis_id=analysis_id)
-        update_progress(analysis_id, 0, "failed", str(e))
-        raise
+    """Main analysis task - runs the analysis pipeline stages in-process"""
+    # Update analysis status
+    update_progress(analysis_id, 0, "starting")
+    logger.info("Analysis pipeline started", analysis_id=analysis_id, task_id=self.request.id)
+
+    # Stages hand their (often multi-MB) payloads to each other directly instead of
+    # serializing them through the broker between chained tasks. Each stage records
+    # its own failure progress before re-raising.
+    git_data = _analyze_git_data_impl(analysis_id, repository_id)
+    combined_data = _analyze_complexity_impl(git_data, analysis_id, repository_id)
+    final_data = _INSIGHTS_STAGE(combined_data, analysis_id, repository_id)
+    return _compile_results_impl(final_data, analysis_id, repository_id)
 
 
 @celery_app.task(bind=True, max_retries=3)
 def analyze_git_data(self, analysis_id: str, repository_id: str):
     """Analyze Git repository data"""
+    return _analyze_git_data_impl(analysis_id, repository_id)
+
+
+def _analyze_git_data_impl(analysis_id: str, repository_id: str):
+    clone_path = None
     try:
         update_progress(analysis_id, 10, "analyzing_git_data")
 
-        async def get_repository():
-            async with AsyncSessionLocal() as db:
-                from sqlalchemy import select
-                result = await db.execute(
-                    select(Repository).where(Repository.id == repository_id)
-                )
-                return result.scalar_one()
+        with SyncSessionLocal() as db:
+            repository = db.execute(
+                select(Repository).where(Repository.id == repository_id)
+            ).scalar_one()
 
-        repository = _run_async(get_repository())
-        git_service = GitService()
+        git_service = _service("git")
         cache_key = f"git_analysis:{repository_id}"
 
         cached_data = _run_async(cache_manager.get(cache_key))
@@ -86,27 +147,42 @@ def analyze_git_data(self, analysis_id: str, repository_id: str):
             mapped = 12 + int((percent / 100) * 8)
             update_progress(analysis_id, mapped, "cloning_repository")
 
+        # Keyed by analysis so concurrent analyses of one repository never share,
+        # or remove, each other's checkout while it lives across stages.
         clone_path = git_service.clone_repository(
             repository.url,
-            str(repository.id),
+            f"{repository.id}_{analysis_id}",
             progress_callback=clone_progress,
         )
         update_progress(analysis_id, 20, "git_clone_complete")
 
-        commits = git_service.get_commits(clone_path)
-        update_progress(analysis_id, 28, "commit_extraction_complete")
+        # The three extractions only read the checkout and spend most of their time
+        # in git subprocesses, so they run side by side.
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            commits_future = executor.submit(git_service.get_commits, clone_path)
+            contributors_future = executor.submit(
+                git_service.get_contributors,
+                clone_path,
+                max_count=settings.MAX_COMMITS_TO_ANALYZE,
+            )
+            # Extensions are tallied while the tree is built rather than re-walked after.
+            language_counts = Counter()
+            file_tree_future = executor.submit(
+                git_service.get_file_tree,
+                clone_path,
+                language_stats=language_counts,
+            )
+
+            commits = commits_future.result()
+            update_progress(analysis_id, 28, "commit_extraction_complete")
 
-        contributors = git_service.get_contributors(
-            clone_path,
-            max_count=settings.MAX_COMMITS_TO_ANALYZE,
-        )
-        update_progress(analysis_id, 34, "contributor_extraction_complete")
+            contributors = contributors_future.result()
+            update_progress(analysis_id, 34, "contributor_extraction_complete")
 
-        file_tree = git_service.get_file_tree(clone_path)
-        update_progress(analysis_id, 38, "file_tree_extraction_complete")
+            file_tree = file_tree_future.result()
+            update_progress(analysis_id, 38, "file_tree_extraction_complete")
 
-        language_stats = extract_language_stats(file_tree)
-        git_service.cleanup(clone_path)
+        language_stats = dict(language_counts)
 
         result_data = {
             "commits": commits,
@@ -117,14 +193,20 @@ def analyze_git_data(self, analysis_id: str, repository_id: str):
             "total_contributors": len(contributors)
         }
 
-        _run_async(cache_manager.set(cache_key, make_json_safe(result_data), 3600))
-        
+        # cache_manager encodes with orjson, which already writes datetimes as ISO strings.
+        _run_async(cache_manager.set(cache_key, result_data, 3600))
+        # The checkout is reused by analyze_complexity and removed by compile_results.
+        # It is not cached: it does not outlive this pipeline run.
+        result_data["clone_path"] = clone_path
+
         update_progress(analysis_id, 40, "git_analysis_complete")
         logger.info("Git analysis completed", analysis_id=analysis_id)
         
         return result_data
     except Exception as e:
         logger.error("Git analysis failed", error=str(e), analysis_id=analysis_id)
+        if clone_path:
+            _service("git").cleanup(clone_path)
         update_progress(analysis_id, 10, "failed", str(e))
         raise
 
@@ -132,46 +214,48 @@ def analyze_git_data(self, analysis_id: str, repository_id: str):
 @celery_app.task(bind=True, max_retries=3)
 def analyze_complexity(self, git_data: dict, analysis_id: str, repository_id: str):
     """Analyze code complexity"""
+    return _analyze_complexity_impl(git_data, analysis_id, repository_id)
+
+
+def _analyze_complexity_impl(git_data: dict, analysis_id: str, repository_id: str):
+    clone_path = None
+    owns_clone = False
     try:
         update_progress(analysis_id, 50, "analyzing_complexity")
         
-        async def process():
-            async with AsyncSessionLocal() as db:
-                # Get repository
-                from sqlalchemy import select
-                result = await db.execute(
+        # Initialize services
+        git_service = _service("git")
+        complexity_service = _service("complexity")
+
+        # Reuse the checkout from analyze_git_data; a cached git analysis has none.
+        clone_path = git_data.get("clone_path")
+        owns_clone = not (clone_path and os.path.isdir(clone_path))
+        if owns_clone:
+            with SyncSessionLocal() as db:
+                repository = db.execute(
                     select(Repository).where(Repository.id == repository_id)
-                )
-                repository = result.scalar_one()
-                
-                # Initialize services
-                git_service = GitService()
-                complexity_service = ComplexityService()
-                
-                # Clone repository
-                clone_path = git_service.clone_repository(repository.url, str(repository.id) + "_complexity")
-                
-                # Analyze complexity
-                complexity_results = complexity_service.analyze_directory(clone_path)
-                
-                # Extract hotspots (most complex files)
-                hotspots = sorted(
-                    complexity_results,
-                    key=lambda x: x.get('cyclomatic_complexity', 0),
-                    reverse=True
-                )[:20]
-                
-                # Cleanup
-                git_service.cleanup(clone_path)
-                
-                result_data = {
-                    "complexity_metrics": complexity_results,
-                    "hotspots": hotspots
-                }
-                
-                return result_data
-        
-        result_data = _run_async(process())
+                ).scalar_one()
+            clone_path = git_service.clone_repository(
+                repository.url, f"{repository.id}_{analysis_id}_complexity"
+            )
+
+        # Analyze complexity
+        complexity_results = complexity_service.analyze_directory(clone_path)
+
+        # Extract hotspots (most complex files); same order as a full descending sort
+        hotspots = heapq.nlargest(
+            20,
+            complexity_results,
+            key=lambda x: x.get('cyclomatic_complexity', 0),
+        )
+
+        if owns_clone:
+            git_service.cleanup(clone_path)
+
+        result_data = {
+            "complexity_metrics": complexity_results,
+            "hotspots": hotspots
+        }
         update_progress(analysis_id, 60, "complexity_scan_complete")
         
         update_progress(analysis_id, 70, "complexity_analysis_complete")
@@ -180,6 +264,9 @@ def analyze_complexity(self, git_data: dict, analysis_id: str, repository_id: st
         return {**git_data, **result_data}
     except Exception as e:
         logger.error("Complexity analysis failed", error=str(e), analysis_id=analysis_id)
+        if owns_clone and clone_path:
+            _service("git").cleanup(clone_path)
+        _release_clone(git_data)
         update_progress(analysis_id, 50, "failed", str(e))
         raise
 
@@ -187,62 +274,106 @@ def analyze_complexity(self, git_data: dict, analysis_id: str, repository_id: st
 @celery_app.task(bind=True, max_retries=3)
 def generate_ai_insights(self, combined_data: dict, analysis_id: str, repository_id: str):
     """Generate AI-powered insights"""
+    return _INSIGHTS_STAGE(combined_data, analysis_id, repository_id)
+
+
+def _insight_inputs(combined_data: dict) -> tuple:
+    """Positional build_insights/cache_key arguments taken from the stage payload."""
+    return (
+        combined_data.get("commits", []),
+        combined_data.get("contributors", []),
+        combined_data.get("complexity_metrics", []),
+        combined_data.get("hotspots", []),
+        combined_data.get("language_stats", {}),
+        combined_data.get("file_tree"),
+    )
+
+
+def _deterministic_insights_impl(combined_data: dict, analysis_id: str, repository_id: str):
+    """Insights stage when AI is off: no LLM setup, no payload copy."""
+    try:
+        # build_insights already reuses its persisted result for unchanged inputs.
+        deterministic_insights = _service("insight").build_insights(
+            *_insight_inputs(combined_data), repository_id
+        )
+        logger.info("Skipping AI insights (disabled or missing key)", analysis_id=analysis_id)
+        combined_data["ai_insights"] = {
+            "enabled": False,
+            "reason": "missing_or_disabled_api_key",
+            "deterministic_insights": deterministic_insights,
+        }
+        update_progress(analysis_id, 90, "ai_insights_skipped")
+        return combined_data
+    except Exception as e:
+        logger.error("AI insights generation failed", error=str(e), analysis_id=analysis_id)
+        _release_clone(combined_data)
+        update_progress(analysis_id, 80, "failed", str(e))
+        raise
+
+
+def _generate_ai_insights_impl(combined_data: dict, analysis_id: str, repository_id: str):
     try:
         update_progress(analysis_id, 80, "generating_ai_insights")
-        insight_service = InsightService()
+        insight_service = _service("insight")
+        insight_inputs = _insight_inputs(combined_data)
+        insight_key = insight_service.cache_key(*insight_inputs, repository_id)
+        # build_insights already reuses its persisted result for unchanged inputs.
         deterministic_insights = insight_service.build_insights(
-            combined_data.get("commits", []),
-            combined_data.get("contributors", []),
-            combined_data.get("complexity_metrics", []),
-            combined_data.get("hotspots", []),
-            combined_data.get("language_stats", {}),
-            combined_data.get("file_tree"),
+            *insight_inputs, repository_id, key=insight_key
         )
 
-        if not settings.ENABLE_AI_INSIGHTS or not settings.OPENAI_API_KEY:
-            logger.info("Skipping AI insights (disabled or missing key)", analysis_id=analysis_id)
-            update_progress(analysis_id, 90, "ai_insights_skipped")
-            return {
-                **combined_data,
-                "ai_insights": {
-                    "enabled": False,
-                    "reason": "missing_or_disabled_api_key",
-                    "deterministic_insights": deterministic_insights,
-                },
-            }
-        
+        # LLM calls dominate this stage; reuse their output for the same repository and
+        # input key, so no other repository can ever be served these results.
+        ai_cache_key = f"ai_insights:{repository_id}:{insight_key}"
+
         async def process():
-            ai_service = AIService()
-            
-            # Generate insights
-            coding_patterns = await ai_service.analyze_coding_patterns(
-                combined_data.get('commits', []),
-                combined_data.get('complexity_metrics', [])
-            )
-            
-            team_dynamics = await ai_service.analyze_team_dynamics(
-                combined_data.get('contributors', []),
-                combined_data.get('commits', [])
-            )
+            cached = await cache_manager.get(ai_cache_key)
+            if cached:
+                logger.info("Using cached LLM insights", analysis_id=analysis_id)
+                return cached
+
+            ai_service = _service("ai")
             
-            migrations = await ai_service.detect_migrations(
-                combined_data.get('language_stats', {})
+            # The three LLM calls are independent, so they run concurrently.
+            results = await asyncio.gather(
+                ai_service.analyze_coding_patterns(
+                    combined_data.get('commits', []),
+                    combined_data.get('complexity_metrics', [])
+                ),
+                ai_service.analyze_team_dynamics(
+                    combined_data.get('contributors', []),
+                    combined_data.get('commits', [])
+                ),
+                ai_service.detect_migrations(
+                    combined_data.get('language_stats', {})
+                ),
+                return_exceptions=True,
             )
-            
+            # Collecting exceptions lets every call settle before the first failure propagates.
+            for item in results:
+                if isinstance(item, BaseException):
+                    raise item
+            coding_patterns, team_dynamics, migrations = results
+
+            generated = {
+                "coding_patterns": coding_patterns,
+                "team_dynamics": team_dynamics,
+                "migrations": migrations
+            }
+            # Failed calls come back as {"error": ...}; only cache complete results.
+            if not any("error" in item for item in generated.values()):
+                await cache_manager.set(ai_cache_key, generated, settings.AI_INSIGHTS_CACHE_TTL_SECONDS)
+
+            return generated
+        
+        try:
             result_data = {
                 "ai_insights": {
                     "enabled": True,
                     "deterministic_insights": deterministic_insights,
-                    "coding_patterns": coding_patterns,
-                    "team_dynamics": team_dynamics,
-                    "migrations": migrations
+                    **_run_async(process()),
                 }
             }
-            
-            return result_data
-        
-        try:
-            result_data = _run_async(process())
         except Exception as ai_error:
             logger.warning("LLM insights failed, continuing with deterministic insights", error=str(ai_error))
             result_data = {
@@ -260,74 +391,77 @@ def generate_ai_insights(self, combined_data: dict, analysis_id: str, repository
         return {**combined_data, **result_data}
     except Exception as e:
         logger.error("AI insights generation failed", error=str(e), analysis_id=analysis_id)
+        _release_clone(combined_data)
         update_progress(analysis_id, 80, "failed", str(e))
         raise
 
 
+_INSIGHTS_STAGE = _generate_ai_insights_impl if AI_INSIGHTS_ACTIVE else _deterministic_insights_impl
+
+
 @celery_app.task(bind=True, max_retries=3)
 def compile_results(self, final_data: dict, analysis_id: str, repository_id: str):
     """Compile all results and update database"""
+    return _compile_results_impl(final_data, analysis_id, repository_id)
+
+
+def _compile_results_impl(final_data: dict, analysis_id: str, repository_id: str):
     try:
         update_progress(analysis_id, 95, "compiling_results")
         safe_data = make_json_safe(final_data)
         
-        async def process():
-            async with AsyncSessionLocal() as db:
-                # Get analysis
-                from sqlalchemy import select
-                result = await db.execute(
-                    select(Analysis).where(Analysis.id == analysis_id)
+        with SyncSessionLocal() as db:
+            # Load the analysis and its repository in one round-trip
+            analysis, repository = db.execute(
+                select(Analysis, Repository)
+                .join(Repository, Analysis.repository_id == Repository.id)
+                .where(Analysis.id == analysis_id, Repository.id == repository_id)
+            ).one()
+
+            # Update analysis with results
+            analysis.status = "completed"
+            analysis.progress = 100
+            analysis.completed_at = datetime.utcnow()
+            analysis.file_tree_data = safe_data.get('file_tree')
+            analysis.contributor_network = safe_data.get('contributors')
+            analysis.complexity_metrics = safe_data.get('complexity_metrics')
+            analysis.hotspots = safe_data.get('hotspots')
+            analysis.language_evolution = safe_data.get('language_stats')
+            analysis.ai_insights = safe_data.get('ai_insights')
+            analysis.commits_analyzed = len(safe_data.get('commits', []))
+            if analysis.created_at:
+                analysis.processing_time_seconds = int(
+                    (datetime.utcnow() - analysis.created_at.replace(tzinfo=None)).total_seconds()
                 )
-                analysis = result.scalar_one()
-                
-                # Update analysis with results
-                analysis.status = "completed"
-                analysis.progress = 100
-                analysis.completed_at = datetime.utcnow()
-                analysis.file_tree_data = safe_data.get('file_tree')
-                analysis.contributor_network = safe_data.get('contributors')
-                analysis.complexity_metrics = safe_data.get('complexity_metrics')
-                analysis.hotspots = safe_data.get('hotspots')
-                analysis.language_evolution = safe_data.get('language_stats')
-                analysis.ai_insights = safe_data.get('ai_insights')
-                analysis.commits_analyzed = len(safe_data.get('commits', []))
-                if analysis.created_at:
-                    analysis.processing_time_seconds = int(
-                        (datetime.utcnow() - analysis.created_at.replace(tzinfo=None)).total_seconds()
-                    )
-                else:
-                    analysis.processing_time_seconds = 0
-                
-                # Update repository stats
-                result = await db.execute(
-                    select(Repository).where(Repository.id == repository_id)
-                )
-                repository = result.scalar_one()
-                
-                repository.total_commits = len(safe_data.get('commits', []))
-                repository.total_contributors = len(safe_data.get('contributors', []))
-                repository.total_files = len(safe_data.get('complexity_metrics', []))
-                repository.is_analyzed = True
-                repository.last_analyzed_at = datetime.utcnow()
-                
-                await db.commit()
-                
-                return {
-                    "analysis_id": analysis_id,
-                    "repository_id": repository_id,
-                    "total_commits": repository.total_commits,
-                    "total_contributors": repository.total_contributors,
-                    "total_files": repository.total_files
-                }
-        
-        result_data = _run_async(process())
-        
+            else:
+                analysis.processing_time_seconds = 0
+
+            # Update repository stats
+            repository.total_commits = len(safe_data.get('commits', []))
+            repository.total_contributors = len(safe_data.get('contributors', []))
+            repository.total_files = len(safe_data.get('complexity_metrics', []))
+            repository.is_analyzed = True
+            repository.last_analyzed_at = datetime.utcnow()
+
+            db.commit()
+
+            result_data = {
+                "analysis_id": analysis_id,
+                "repository_id": repository_id,
+                "total_commits": repository.total_commits,
+                "total_contributors": repository.total_contributors,
+                "total_files": repository.total_files
+            }
+
+        _release_clone(final_data)
+
         update_progress(analysis_id, 100, "completed")
         logger.info("Analysis completed", analysis_id=analysis_id)
         
         return result_data
     except Exception as e:
         logger.error("Failed to compile results", error=str(e), analysis_id=analysis_id)
+        _release_clone(final_data)
         update_progress(analysis_id, 95, "failed", str(e))
         raise
 
@@ -335,58 +469,53 @@ def compile_results(self, final_data: dict, analysis_id: str, repository_id: str
 def update_progress(analysis_id: str, progress: int, status: str, error_message: str = None):
     """Update analysis progress and broadcast via WebSocket"""
     try:
-        async def update():
-            async with AsyncSessionLocal() as db:
-                from sqlalchemy import select, update
-                
-                # Update database
+        now = time.monotonic()
+        terminal = status in _TERMINAL_STATUSES
+        last_flush = _last_progress_flush.get(analysis_id)
+        if terminal or last_flush is None or now - last_flush >= PROGRESS_FLUSH_INTERVAL_SECONDS:
+            # Update database
+            with SyncSessionLocal() as db:
                 stmt = update(Analysis).where(Analysis.id == analysis_id).values(
                     progress=progress,
                     status=status,
                     error_message=error_message
                 )
-                await db.execute(stmt)
-                await db.commit()
-                
-                # Broadcast via Redis Pub/Sub for API websocket fanout
-                await publish_progress_event({
-                    'analysis_id': analysis_id,
-                    'progress': progress,
-                    'status': status,
-                    'error_message': error_message
-                })
-        
-        _run_async(update())
-        
+                db.execute(stmt)
+                db.commit()
+            # Entries past the interval would flush on their next tick anyway, so
+            # dropping them loses nothing and bounds the map when a pipeline dies
+            # without reaching a terminal status.
+            for key, flushed_at in list(_last_progress_flush.items()):
+                if now - flushed_at >= PROGRESS_FLUSH_INTERVAL_SECONDS:
+                    del _last_progress_flush[key]
+            if terminal:
+                _last_progress_flush.pop(analysis_id, None)
+            else:
+                _last_progress_flush[analysis_id] = now
+
+        # Broadcast via Redis Pub/Sub for API websocket fanout
+        _run_async(publish_progress_event({
+            'analysis_id': analysis_id,
+            'progress': progress,
+            'status': status,
+            'error_message': error_message
+        }))
+
     except Exception as e:
         logger.error("Failed to update progress", error=str(e), analysis_id=analysis_id)
 
 
-def extract_language_stats(file_tree: dict) -> dict:
-    """Extract language statistics from file tree"""
-    lang_stats = {}
-    
-    def traverse(node):
-        if node.get('type') == 'file':
-            _, ext = node.get('path', '').rsplit('.', 1) if '.' in node.get('path', '') else ('', '')
-            if ext:
-                lang_stats[ext] = lang_stats.get(ext, 0) + 1
-        
-        for child in node.get('children', []):
-            traverse(child)
-    
-    traverse(file_tree)
-    return lang_stats
+def _release_clone(data: dict) -> None:
+    """Remove the checkout handed down the chain by analyze_git_data, if any."""
+    clone_path = data.get("clone_path")
+    if clone_path:
+        _service("git").cleanup(clone_path)
 
 
 def make_json_safe(value):
-    """Recursively convert datetime-like values to JSON-safe values."""
-    if isinstance(value, datetime):
-        return value.isoformat()
-    if isinstance(value, dict):
-        return {k: make_json_safe(v) for k, v in value.items()}
-    if isinstance(value, list):
-        return [make_json_safe(v) for v in value]
-    if isinstance(value, tuple):
-        return [make_json_safe(v) for v in value]
-    return value
+    """Convert datetime-like values to JSON-safe values via an orjson round-trip.
+
+    orjson serializes datetimes to the same ISO strings as ``isoformat()`` in C,
+    which is far cheaper than re-allocating every nested dict/list in Python.
+    """
+    return orjson.loads(orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS))
@@ -8,6 +8,7 @@ import asyncio
 import pytest
 import pytest_asyncio
 from httpx import AsyncClient
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.pool import StaticPool
 
@@ -30,7 +31,24 @@ if TEST_DATABASE_URL.startswith("sqlite"):
 
 engine = create_async_engine(TEST_DATABASE_URL, **engine_kwargs)
 
-TestingSessionLocal = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+if TEST_DATABASE_URL.startswith("sqlite"):
+    # pysqlite defers BEGIN and breaks SAVEPOINT; let SQLAlchemy emit BEGIN itself.
+    @event.listens_for(engine.sync_engine, "connect")
+    def _sqlite_disable_autobegin(dbapi_connection, _record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine.sync_engine, "begin")
+    def _sqlite_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+# Sessions join the per-test outer transaction through a SAVEPOINT, so commits made
+# by the app under test are still rolled back when the test ends.
+TestingSessionLocal = async_sessionmaker(
+    engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+    join_transaction_mode="create_savepoint",
+)
 
 
 async def override_get_db():
@@ -51,15 +69,15 @@ def event_loop():
 
 
 @pytest_asyncio.fixture
-async def client():
+async def client(db_connection):
     """Create test client"""
     async with AsyncClient(app=app, base_url="http://test") as client:
         yield client
 
 
-@pytest_asyncio.fixture(autouse=True)
+@pytest_asyncio.fixture(scope="session")
 async def setup_database():
-    """Setup and teardown test database"""
+    """Create the test schema once per session and drop it at the end"""
     # Create tables
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
@@ -69,10 +87,24 @@ async def setup_database():
     # Drop tables
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.drop_all)
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def db_connection(setup_database):
+    """Run each test inside an outer transaction that is rolled back afterwards"""
+    async with engine.connect() as conn:
+        trans = await conn.begin()
+        TestingSessionLocal.configure(bind=conn)
+        try:
+            yield conn
+        finally:
+            TestingSessionLocal.configure(bind=engine)
+            await trans.rollback()
 
 
 @pytest_asyncio.fixture
-async def db_session():
+async def db_session(db_connection):
     """Create test database session"""
     async with TestingSessionLocal() as session:
         yield session
@@ -0,0 +1,233 @@
+"""
+Test insight service outputs on boundary inputs
+"""
+
+from datetime import datetime, timedelta, timezone
+import os
+
+import pytest
+
+from app.services.insight_service import InsightService
+
+
+MONDAY = datetime(2024, 1, 1, 10, 0)
+
+
+def make_commit(sha, committed_at, author="alice", insertions=10, deletions=0, message="update"):
+    """Build a raw commit dict shaped like GitService.get_commits output"""
+    return {
+        "sha": sha,
+        "message": message,
+        "author_name": author,
+        "committed_at": committed_at,
+        "stats": {"insertions": insertions, "deletions": deletions, "files": 1},
+    }
+
+
+@pytest.fixture
+def insight_service(tmp_path):
+    """Insight service persisting into a per-test cache directory"""
+    return InsightService(cache_dir=str(tmp_path))
+
+
+def weekly_rows(insights):
+    digest = insights["weekly_health_digest"]
+    return digest["latest_week"], [(w["week"], w["commits"], w["contributors"]) for w in digest["weeks"]]
+
+
+def test_weekly_digest_keeps_latest_sixteen_weeks(insight_service):
+    """Test the oldest of seventeen weekly commits falls out of the digest"""
+    commits = [
+        make_commit(f"{i:040x}", MONDAY + timedelta(weeks=i), author=f"dev{i % 3}")
+        for i in range(17)
+    ]
+
+    insights = insight_service.build_insights(commits, [], [], [], {}, None)
+
+    latest_week, weeks = weekly_rows(insights)
+    assert latest_week == "2024-W17"
+    assert weeks == [(f"2024-W{n:02d}", 1, 1) for n in range(2, 18)]
+    assert insights["weekly_health_digest"]["trend"]["commit_delta_percent"] == 0.0
+
+
+def test_weekly_digest_window_edge(insight_service):
+    """Test commits either side of the 16th-latest week's Monday"""
+    commits = [make_commit(f"a{i:039x}", MONDAY + timedelta(weeks=i, days=2)) for i in range(1, 17)]
+    commits.append(make_commit("b" * 40, datetime(2024, 1, 7, 23, 59), author="bob"))
+    commits.append(make_commit("c" * 40, datetime(2024, 1, 8, 0, 0), author="carol"))
+
+    latest_week, weeks = weekly_rows(insight_service.build_insights(commits, [], [], [], {}, None))
+
+    assert latest_week == "2024-W17"
+    assert weeks[0] == ("2024-W02", 2, 2)
+    assert weeks[1:] == [(f"2024-W{n:02d}", 1, 1) for n in range(3, 18)]
+
+
+def test_weekly_digest_buckets_by_local_week(insight_service):
+    """Test timezone-aware commits land in their local ISO week at the window edge"""
+    commits = [
+        make_commit(f"d{i:039x}", (MONDAY + timedelta(weeks=i, days=3)).replace(tzinfo=timezone.utc))
+        for i in range(1, 17)
+    ]
+    # Local Monday of W02, but Sunday in UTC.
+    commits.append(
+        make_commit("e" * 40, datetime(2024, 1, 8, 1, 0, tzinfo=timezone(timedelta(hours=5))), author="erin")
+    )
+    # Local Sunday of W01, but Monday in UTC.
+    commits.append(
+        make_commit("f" * 40, datetime(2024, 1, 7, 20, 0, tzinfo=timezone(timedelta(hours=-8))), author="frank")
+    )
+
+    latest_week, weeks = weekly_rows(insight_service.build_insights(commits, [], [], [], {}, None))
+
+    assert latest_week == "2024-W17"
+    assert weeks[0] == ("2024-W02", 2, 2)
+    assert len(weeks) == 16
+
+
+def test_weekly_digest_sparse_history(insight_service):
+    """Test weeks without commits are skipped rather than counted toward the window"""
+    commits = [
+        make_commit("1" * 40, datetime(2020, 6, 1, 9)),
+        make_commit("2" * 40, datetime(2023, 12, 31, 23, 0)),
+    ]
+    commits += [make_commit(f"9{i:039x}", MONDAY + timedelta(weeks=3 * i)) for i in range(6)]
+
+    latest_week, weeks = weekly_rows(insight_service.build_insights(commits, [], [], [], {}, None))
+
+    assert latest_week == "2024-W16"
+    assert [week for week, _commits, _contributors in weeks] == [
+        "2020-W23",
+        "2023-W52",
+        "2024-W01",
+        "2024-W04",
+        "2024-W07",
+        "2024-W10",
+        "2024-W13",
+        "2024-W16",
+    ]
+
+
+def make_contributors(commit_counts):
+    """Build contributor dicts shaped like GitService.get_contributors output"""
+    return [
+        {"name": f"c{i:02d}", "email": f"c{i:02d}@example.com", "commits": count}
+        for i, count in enumerate(commit_counts)
+    ]
+
+
+def contributor_insights(service, commit_counts):
+    commits = [make_commit(f"{i:040x}", MONDAY + timedelta(days=i)) for i in range(3)]
+    return service.build_insights(commits, make_contributors(commit_counts), [], [], {}, None)
+
+
+def ranked_names(insights):
+    team = insights["team_dynamics"]
+    scenarios = insights["bus_factor_shock_test"]["scenarios"]
+    return (
+        team["bus_factor_50_percent"],
+        [c["name"] for c in team["top_contributors"]],
+        scenarios[-1]["removed_contributors"] if scenarios else [],
+    )
+
+
+def test_contributor_ranking_all_tied(insight_service):
+    """Test equal commit counts keep input order past the ranked prefix"""
+    bus_factor, top, removed = ranked_names(contributor_insights(insight_service, [5] * 30))
+
+    assert bus_factor == 15
+    assert top == ["c00", "c01", "c02", "c03", "c04"]
+    assert removed == ["c00", "c01", "c02", "c03", "c04"]
+
+
+def test_contributor_ranking_tie_at_prefix_cutoff(insight_service):
+    """Test a tie spanning the ranked-prefix cutoff"""
+    insights = contributor_insights(insight_service, [50, 40, 30] + [2] * 21)
+
+    bus_factor, top, removed = ranked_names(insights)
+    assert bus_factor == 2
+    assert top == ["c00", "c01", "c02", "c03", "c04"]
+    assert removed == ["c00", "c01", "c02", "c03", "c04"]
+    scenarios = insights["bus_factor_shock_test"]["scenarios"]
+    assert [s["new_bus_factor_50_percent"] for s in scenarios] == [2, 4, 11, 10, 10]
+
+
+def test_contributor_ranking_degenerate_counts(insight_service):
+    """Test negative, missing and non-numeric counts rank as in a full sort"""
+    counts = [40, -100, "7", None, 3, 0, -5, 2, "x", 1, 1]
+
+    bus_factor, top, removed = ranked_names(contributor_insights(insight_service, counts))
+
+    assert bus_factor == 0
+    assert top == ["c00", "c02", "c04", "c07", "c09"]
+    assert removed == ["c00", "c02", "c04", "c07", "c09"]
+
+
+def test_contributor_ranking_skips_zero_counts(insight_service):
+    """Test zero-commit contributors rank last and are never removed"""
+    bus_factor, top, removed = ranked_names(contributor_insights(insight_service, [10, 0, 6, 0, 4, 0]))
+
+    assert bus_factor == 1
+    assert top == ["c00", "c02", "c04", "c01", "c03"]
+    assert removed == ["c00", "c02", "c04"]
+
+
+def shock_rows(insights):
+    shock = insights["bus_factor_shock_test"]
+    return shock["baseline_bus_factor_50_percent"], [
+        (s["new_bus_factor_50_percent"], s["coverage_lost_percent"]) for s in shock["scenarios"]
+    ]
+
+
+@pytest.mark.parametrize(
+    "commit_counts, baseline, scenarios",
+    [
+        # The first contributor covers exactly half of all commits.
+        ([5, 5], 1, [(1, 50.0), (0, 100.0)]),
+        # Odd total: half is never hit exactly.
+        ([4, 3, 2], 2, [(1, 44.44), (1, 77.78), (0, 100.0)]),
+        ([9], 1, [(0, 100.0)]),
+        ([100] + [1] * 40, 1, [(20, 71.43), (20, 72.14), (19, 72.86), (19, 73.57), (18, 74.29)]),
+        ([5] * 30, 15, [(15, 3.33), (14, 6.67), (14, 10.0), (13, 13.33), (13, 16.67)]),
+    ],
+)
+def test_bus_factor_shock_remaining_bus_factor(insight_service, commit_counts, baseline, scenarios):
+    """Test remaining bus factors at the 50% coverage boundary"""
+    insights = contributor_insights(insight_service, commit_counts)
+
+    assert shock_rows(insights) == (baseline, scenarios)
+
+
+def cache_key_inputs():
+    commits = [make_commit(f"{i:040x}", MONDAY - timedelta(days=i)) for i in range(3)]
+    metrics = [{"path": "app.py", "cyclomatic_complexity": 12}]
+    return [commits, make_contributors([3]), metrics, metrics, {"py": 1}, {"children": [{"path": "app.py"}]}]
+
+
+def test_cache_key_scoped_to_repository_and_metrics(insight_service):
+    """Test keys differ across repositories and for changed metrics under the same head"""
+    inputs = cache_key_inputs()
+    key = insight_service.cache_key(*inputs, "repo-1")
+
+    assert insight_service.cache_key(*cache_key_inputs(), "repo-1") == key
+    assert insight_service.cache_key(*inputs, "repo-2") != key
+
+    changed = cache_key_inputs()
+    changed[2] = [{"path": "app.py", "cyclomatic_complexity": 13}]
+    assert insight_service.cache_key(*changed, "repo-1") != key
+
+
+def test_build_insights_prunes_expired_entries_on_interval(insight_service, tmp_path):
+    """Test expired cache files are removed at most once per prune interval"""
+    stale = tmp_path / "stale.json"
+    stale.write_text("{}")
+    os.utime(stale, (0, 0))
+
+    insight_service.build_insights(*cache_key_inputs(), "repo-1")
+    assert not stale.exists()
+
+    stale.write_text("{}")
+    os.utime(stale, (0, 0))
+    insight_service.build_insights(*cache_key_inputs(), "repo-2")
+    assert stale.exists()
+    assert len(list(tmp_path.glob("*.json"))) == 3
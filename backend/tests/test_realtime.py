@@ -0,0 +1,156 @@
+"""
+Test progress stream replay
+"""
+
+import json
+
+import pytest
+
+from app.core import realtime
+
+
+class FakeStreamClient:
+    """Minimal stand-in for the redis.asyncio stream client used by realtime"""
+
+    def __init__(self, streams=None, error=None):
+        self.streams = streams or {}
+        self.error = error
+        self.closed = False
+        self.read_from = []
+        # Entries appended once a subscriber has resolved the stream tail.
+        self.arriving = []
+
+    async def xrange(self, name, min="-"):
+        if self.error:
+            raise self.error
+        entries = self.streams.get(name, [])
+        if min.startswith("("):
+            # Single-digit test ids compare correctly as strings.
+            entries = [entry for entry in entries if entry[0] > min[1:]]
+        return list(entries)
+
+    async def xrevrange(self, name, count=None):
+        latest = list(reversed(self.streams.get(name, [])))[:count]
+        self.streams.setdefault(name, []).extend(self.arriving)
+        return latest
+
+    async def xread(self, streams, block=None, count=None):
+        ((name, last_id),) = streams.items()
+        self.read_from.append(last_id)
+        entries = [entry for entry in self.streams.get(name, []) if entry[0] > last_id]
+        return [(name, entries)] if entries else []
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    """Route realtime's Redis connections to a FakeStreamClient"""
+    client = FakeStreamClient()
+
+    async def from_url(*_args, **_kwargs):
+        return client
+
+    monkeypatch.setattr(realtime.redis, "from_url", from_url)
+    return client
+
+
+def progress_entry(entry_id, progress, status):
+    event = {"analysis_id": "a1", "progress": progress, "status": status, "error_message": None}
+    return entry_id, {"data": json.dumps(event)}
+
+
+@pytest.mark.asyncio
+async def test_progress_history_empty_stream(fake_redis):
+    """Test an analysis without recorded events replays nothing"""
+    assert await realtime.progress_history("a1") == []
+    assert fake_redis.closed
+
+
+@pytest.mark.asyncio
+async def test_progress_history_replays_in_order(fake_redis):
+    """Test events replay oldest first and undecodable entries are skipped"""
+    fake_redis.streams[realtime.events_key("a1")] = [
+        progress_entry("1-0", 10, "analyzing_git_data"),
+        ("2-0", {"data": "not json"}),
+        ("3-0", {}),
+        progress_entry("4-0", 40, "git_analysis_complete"),
+    ]
+
+    history = await realtime.progress_history("a1")
+
+    assert [(event["id"], event["progress"], event["status"]) for event in history] == [
+        ("1-0", 10, "analyzing_git_data"),
+        ("4-0", 40, "git_analysis_complete"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_progress_history_after_id(fake_redis):
+    """Test replay from a last-seen id returns only later events"""
+    fake_redis.streams[realtime.events_key("a1")] = [
+        progress_entry("1-0", 10, "analyzing_git_data"),
+        progress_entry("2-0", 40, "git_analysis_complete"),
+        progress_entry("3-0", 60, "analyzing_complexity"),
+    ]
+
+    history = await realtime.progress_history("a1", after_id="2-0")
+
+    assert [(event["id"], event["progress"]) for event in history] == [("3-0", 60)]
+
+
+@pytest.mark.asyncio
+async def test_progress_history_reads_only_its_analysis(fake_redis):
+    """Test replay is scoped to the requested analysis stream"""
+    fake_redis.streams[realtime.events_key("other")] = [progress_entry("1-0", 90, "ai_insights_generated")]
+
+    assert await realtime.progress_history("a1") == []
+
+
+@pytest.mark.asyncio
+async def test_progress_history_redis_error(monkeypatch):
+    """Test a Redis failure yields an empty replay instead of raising"""
+    client = FakeStreamClient(error=ConnectionError("redis down"))
+
+    async def from_url(*_args, **_kwargs):
+        return client
+
+    monkeypatch.setattr(realtime.redis, "from_url", from_url)
+
+    assert await realtime.progress_history("a1") == []
+    assert client.closed
+
+
+@pytest.mark.asyncio
+async def test_subscribe_progress_events_resumes_from_last_id(fake_redis):
+    """Test a resumed subscription reads from the given id instead of the stream tail"""
+    fake_redis.streams[realtime.PROGRESS_STREAM] = [
+        progress_entry("1-0", 10, "analyzing_git_data"),
+        progress_entry("2-0", 40, "git_analysis_complete"),
+        progress_entry("3-0", 60, "analyzing_complexity"),
+    ]
+
+    events = realtime.subscribe_progress_events("1-0")
+    first = await events.__anext__()
+    second = await events.__anext__()
+    await events.aclose()
+
+    assert [(first["id"], first["progress"]), (second["id"], second["progress"])] == [("2-0", 40), ("3-0", 60)]
+    assert fake_redis.read_from == ["1-0"]
+    assert fake_redis.closed
+
+
+@pytest.mark.asyncio
+async def test_subscribe_progress_events_starts_at_tail(fake_redis):
+    """Test a fresh subscription skips entries already in the stream"""
+    fake_redis.streams[realtime.PROGRESS_STREAM] = [progress_entry("1-0", 10, "analyzing_git_data")]
+
+    fake_redis.arriving = [progress_entry("2-0", 40, "git_analysis_complete")]
+
+    events = realtime.subscribe_progress_events()
+    event = await events.__anext__()
+    await events.aclose()
+
+    assert (event["id"], event["progress"]) == ("2-0", 40)
+    assert fake_redis.read_from == ["1-0"]
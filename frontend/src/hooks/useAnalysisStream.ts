@@ -1,12 +1,19 @@
 'use client'
 
-import { useEffect, useState } from 'react'
+import { useEffect, useRef, useState } from 'react'
 import type { AnalysisProgress } from '@/types/domain'
 import { useWebSocket } from '@/lib/websocket'
 
+function isNewerEventId(id: string, lastId: string) {
+  const [ms, seq] = id.split('-').map(Number)
+  const [lastMs, lastSeq] = lastId.split('-').map(Number)
+  return ms > lastMs || (ms === lastMs && seq > lastSeq)
+}
+
 export function useAnalysisStream(analysisId?: string) {
   const { socket, subscribeToAnalysis, unsubscribeFromAnalysis } = useWebSocket()
   const [progress, setProgress] = useState<AnalysisProgress | null>(null)
+  const lastEventId = useRef<string | null>(null)
 
   useEffect(() => {
     if (!analysisId) return
@@ -19,11 +26,16 @@ export function useAnalysisStream(analysisId?: string) {
 
   useEffect(() => {
     if (!socket || !analysisId) return
+    lastEventId.current = null
 
     const onProgress = (event: AnalysisProgress) => {
-      if (event.analysis_id === analysisId) {
-        setProgress(event)
+      if (event.analysis_id !== analysisId) return
+      // Replay and live delivery can overlap right after subscribing; skip ids already seen.
+      if (event.id) {
+        if (lastEventId.current && !isNewerEventId(event.id, lastEventId.current)) return
+        lastEventId.current = event.id
       }
+      setProgress(event)
     }
 
     socket.on("analysis_progress", onProgress)
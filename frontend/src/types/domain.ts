@@ -5,4 +5,6 @@ export interface AnalysisProgress {
   progress: number
   status: AnalysisStatus | string
   error_message?: string | null
+  // Redis stream entry id ("<ms>-<seq>"); replayed and live copies of an event share it.
+  id?: string
 }